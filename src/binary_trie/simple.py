@@ -0,0 +1,221 @@
+from typing import Iterable, List, Optional
+
+
+class BinaryTrie:
+    """
+    Multiset of integers in [0, 2**bits) on a binary trie.
+
+    Children and subtree counts live in flat lists (node 1 is the root, node 0 is an empty null node),
+    so every operation is O(bits) without per-bit node objects.
+    `xor_all(k)` lazily replaces every element a by a ^ k in O(1).
+    """
+
+    __slots__ = ("bits", "_ch", "_cnt", "_xor")
+
+    def __init__(self, bits: int = 60, values: Optional[Iterable[int]] = None) -> None:
+        self.bits = bits
+        self._ch: List[int] = [0, 0, 0, 0]  # _ch[v << 1 | b]: child of v on bit b
+        self._cnt: List[int] = [0, 0]  # number of elements in the subtree
+        self._xor = 0  # lazy xor applied to every stored element
+
+        if values:
+            for x in values:
+                self.add(x)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self)})"
+
+    def __len__(self) -> int:
+        return self._cnt[1]
+
+    def __iter__(self):
+        """Iterates over the elements in ascending order (with multiplicity)."""
+        for i in range(len(self)):
+            yield self.kth(i)
+
+    def __contains__(self, x: int) -> bool:
+        return self.count(x) > 0
+
+    def _check(self, x: int) -> None:
+        if not 0 <= x < 1 << self.bits:
+            raise ValueError(f"value must be in [0, 2**{self.bits}), got {x}")
+
+    def add(self, x: int, k: int = 1) -> None:
+        """Insert k copies of x. O(bits)"""
+        self._check(x)
+        if k <= 0:
+            raise ValueError(f"k must be positive, got {k}")
+        ch, cnt = self._ch, self._cnt
+        s = x ^ self._xor
+        v = 1
+        cnt[v] += k
+        for b in range(self.bits - 1, -1, -1):
+            i = v << 1 | (s >> b & 1)
+            if ch[i] == 0:
+                ch[i] = len(cnt)
+                cnt.append(0)
+                ch.extend((0, 0))
+            v = ch[i]
+            cnt[v] += k
+
+    def discard(self, x: int, k: int = 1) -> int:
+        """Remove up to k copies of x and return how many were removed. O(bits)"""
+        if k < 0:
+            raise ValueError(f"k must be non-negative, got {k}")
+        k = min(k, self.count(x))
+        if k == 0:
+            return 0
+        ch, cnt = self._ch, self._cnt
+        s = x ^ self._xor
+        v = 1
+        cnt[v] -= k
+        for b in range(self.bits - 1, -1, -1):
+            v = ch[v << 1 | (s >> b & 1)]
+            cnt[v] -= k
+        return k
+
+    def count(self, x: int) -> int:
+        """Number of copies of x. O(bits)"""
+        if not 0 <= x < 1 << self.bits:
+            return 0
+        ch = self._ch
+        s = x ^ self._xor
+        v = 1
+        for b in range(self.bits - 1, -1, -1):
+            v = ch[v << 1 | (s >> b & 1)]
+            if v == 0:
+                return 0
+        return self._cnt[v]
+
+    def xor_all(self, k: int) -> None:
+        """Replace every element a by a ^ k. O(1)"""
+        self._check(k)
+        self._xor ^= k
+
+    def count_less(self, x: int) -> int:
+        """Number of elements < x. O(bits)"""
+        if x <= 0:
+            return 0
+        if x >= 1 << self.bits:
+            return len(self)
+        ch, cnt, lz = self._ch, self._cnt, self._xor
+        res = 0
+        v = 1
+        for b in range(self.bits - 1, -1, -1):
+            l = lz >> b & 1  # the child holding elements whose bit b is 0
+            if x >> b & 1:
+                res += cnt[ch[v << 1 | l]]
+                v = ch[v << 1 | l ^ 1]
+            else:
+                v = ch[v << 1 | l]
+            if v == 0:
+                break
+        return res
+
+    def kth(self, k: int) -> int:
+        """Returns the k-th smallest element (0-indexed). O(bits)"""
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("BinaryTrie index out of range")
+        ch, cnt, lz = self._ch, self._cnt, self._xor
+        res = 0
+        v = 1
+        for b in range(self.bits - 1, -1, -1):
+            l = lz >> b & 1
+            c = ch[v << 1 | l]
+            if k < cnt[c]:
+                v = c
+            else:
+                k -= cnt[c]
+                v = ch[v << 1 | l ^ 1]
+                res |= 1 << b
+        return res
+
+    def _xor_extreme(self, x: int, maximize: bool) -> int:
+        self._check(x)
+        if len(self) == 0:
+            raise ValueError("BinaryTrie is empty")
+        ch, cnt = self._ch, self._cnt
+        y = x ^ self._xor
+        res = 0
+        v = 1
+        for b in range(self.bits - 1, -1, -1):
+            want = (y >> b & 1) ^ maximize  # child making bit b of the xor 0 (min) or 1 (max)
+            c = ch[v << 1 | want]
+            if cnt[c] > 0:
+                v = c
+                res |= maximize << b
+            else:
+                v = ch[v << 1 | want ^ 1]
+                res |= (not maximize) << b
+        return res
+
+    def min_xor(self, x: int) -> int:
+        """min(a ^ x for a in self). O(bits)"""
+        return self._xor_extreme(x, False)
+
+    def max_xor(self, x: int) -> int:
+        """max(a ^ x for a in self). O(bits)"""
+        return self._xor_extreme(x, True)
+
+    def min(self) -> int:
+        return self.min_xor(0)
+
+    def max(self) -> int:
+        return self.max_xor(0)
+
+
+if __name__ == "__main__":
+
+    def test():
+        import random
+
+        bits = 8
+        bt = BinaryTrie(bits)
+        ref: List[int] = []
+        for _ in range(3000):
+            t = random.randrange(6)
+            x = random.randrange(1 << bits)
+            if t == 0:
+                k = random.randint(1, 3)
+                bt.add(x, k)
+                ref += [x] * k
+            elif t == 1:
+                k = random.randint(1, 3)
+                removed = min(k, ref.count(x))
+                assert bt.discard(x, k) == removed
+                for _ in range(removed):
+                    ref.remove(x)
+            elif t == 2:
+                bt.xor_all(x)
+                ref = [a ^ x for a in ref]
+            elif t == 3:
+                assert bt.count_less(x) == sum(a < x for a in ref)
+                assert bt.count(x) == ref.count(x)
+            elif t == 4 and ref:
+                k = random.randrange(len(ref))
+                assert bt.kth(k) == sorted(ref)[k]
+            elif t == 5 and ref:
+                assert bt.min_xor(x) == min(a ^ x for a in ref)
+                assert bt.max_xor(x) == max(a ^ x for a in ref)
+            assert len(bt) == len(ref)
+        assert list(bt) == sorted(ref)
+
+        bad_calls = (
+            lambda: bt.add(1, 0),
+            lambda: bt.add(1, -2),
+            lambda: bt.discard(1, -1),
+            lambda: bt.min_xor(1 << bits),
+            lambda: bt.max_xor(-1),
+        )
+        for bad in bad_calls:
+            try:
+                bad()
+                assert False
+            except ValueError:
+                pass
+        print("All tests passed!")
+
+    test()
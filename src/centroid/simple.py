@@ -0,0 +1,278 @@
+from typing import *
+from heapq import heappop, heappush
+
+R = TypeVar("R")
+Branch = Tuple[List[int], List[int]]  # (vertices, distances to the centroid)
+
+
+class CentroidDecomposition:
+    """
+    Centroid decomposition of a (weighted) tree, built without recursion in O(N log N).
+
+    - parent[c], depth[c]: the centroid tree (parent -1 at the root, depth = level).
+    - dist[l][v]: distance from v to its level-l centroid ancestor (for l <= depth[v]).
+    Every path u - v passes through exactly one centroid: the lca of u and v in the centroid tree.
+    `combine` hands each centroid the vertices of its component grouped by branch,
+    which is all a "count / fold the paths through the centroid" step needs.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        edges: Iterable[Tuple[int, int]],
+        weights: Optional[Sequence[int]] = None,
+    ):
+        """
+        :param edges: the n - 1 edges (u, v).
+        :param weights: weights[i] is the length of the i-th edge (default 1).
+        """
+        if n <= 0:
+            raise ValueError("tree must have at least one vertex")
+        self.n = n
+        adj: List[List[int]] = [[] for _ in range(n)]
+        adj_w: List[List[int]] = [[] for _ in range(n)]
+        m = 0
+        for i, (u, v) in enumerate(edges):
+            w = 1 if weights is None else weights[i]
+            adj[u].append(v)
+            adj_w[u].append(w)
+            adj[v].append(u)
+            adj_w[v].append(w)
+            m += 1
+        if m != n - 1:
+            raise ValueError("a tree on n vertices has n - 1 edges")
+
+        self.parent = [-1] * n
+        self.depth = [0] * n
+        self.dist: List[List[int]] = []
+        self.order: List[int] = []  # centroids, parents first
+        # per centroid: vertices of its component grouped by branch (the centroid first), their distances,
+        # and the branch boundaries
+        self._verts: List[List[int]] = [[] for _ in range(n)]
+        self._dists: List[List[int]] = [[] for _ in range(n)]
+        self._bounds: List[List[int]] = [[] for _ in range(n)]
+
+        removed = [False] * n
+        size = [0] * n
+        par = [-1] * n
+        comp = [0]
+        for v in comp:
+            for nv in adj[v]:
+                if nv != par[v]:
+                    par[nv] = v
+                    comp.append(nv)
+                    if len(comp) > n:
+                        break
+            else:
+                continue
+            break
+        if len(comp) != n:
+            raise ValueError("edges do not form a tree")
+
+        # (component in BFS order with par set inside it, parent centroid, level)
+        stk = [(comp, -1, 0)]
+        while stk:
+            comp, pc, lv = stk.pop()
+            s = comp[0]
+            for v in comp:
+                size[v] = 1
+            for i in range(len(comp) - 1, 0, -1):
+                v = comp[i]
+                size[par[v]] += size[v]
+            half = len(comp) // 2
+            c = s
+            while True:
+                for nv in adj[c]:
+                    if size[nv] > half and nv != par[c] and not removed[nv]:
+                        c = nv
+                        break
+                else:
+                    break
+
+            self.parent[c] = pc
+            self.depth[c] = lv
+            self.order.append(c)
+            if lv == len(self.dist):
+                self.dist.append([0] * n)
+            dl = self.dist[lv]
+
+            # distances from c, one branch at a time; each branch is the next component
+            verts, bounds = [c], [1]
+            dl[c] = 0
+            removed[c] = True
+            for b, wb in zip(adj[c], adj_w[c]):
+                if removed[b]:
+                    continue
+                dl[b] = wb
+                par[b] = c
+                sub = [b]
+                for v in sub:
+                    pv, dv = par[v], dl[v]
+                    for nv, w in zip(adj[v], adj_w[v]):
+                        if nv != pv and not removed[nv]:
+                            par[nv] = v
+                            dl[nv] = dv + w
+                            sub.append(nv)
+                verts += sub
+                bounds.append(len(verts))
+                stk.append((sub, c, lv + 1))
+            self._verts[c] = verts
+            self._dists[c] = [dl[v] for v in verts]
+            self._bounds[c] = bounds
+
+        # nearest marked vertex
+        self._marked = [False] * n
+        self._heap: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+
+        self.root = self.order[0]
+
+    def ancestors(self, v: int) -> Iterator[Tuple[int, int]]:
+        """(c, dist(v, c)) for every centroid ancestor c of v, v itself first. O(log N)"""
+        c = v
+        while c != -1:
+            yield c, self.dist[self.depth[c]][v]
+            c = self.parent[c]
+
+    def branches(self, c: int) -> List[Branch]:
+        """The component of centroid c split into its branches; the first is [c] alone."""
+        verts, dists, bounds = self._verts[c], self._dists[c], self._bounds[c]
+        res = [([c], [0])]
+        for lo, hi in zip(bounds, bounds[1:]):
+            res.append((verts[lo:hi], dists[lo:hi]))
+        return res
+
+    def combine(self, hook: Callable[[int, List[Branch]], R]) -> List[R]:
+        """
+        Calls hook(c, branches(c)) for every centroid (parents first) and returns the results.
+        A path through c joins two vertices of different branches (or c itself), so each
+        path is seen by exactly one hook call. O(N log N) in total besides the hooks.
+        """
+        return [hook(c, self.branches(c)) for c in self.order]
+
+    def count_paths_with_length_le(self, k: int) -> int:
+        """Number of unordered pairs {u, v}, u != v, with dist(u, v) <= k. O(N log^2 N)"""
+
+        def pairs_le(ds: List[int]) -> int:
+            ds = sorted(ds)
+            res = 0
+            j = len(ds) - 1
+            for i, d in enumerate(ds):
+                while j > i and d + ds[j] > k:
+                    j -= 1
+                if j <= i:
+                    break
+                res += j - i
+            return res
+
+        def hook(c: int, branches: List[Branch]) -> int:
+            res = pairs_le(self._dists[c])
+            for _, ds in branches[1:]:
+                res -= pairs_le(ds)
+            return res
+
+        return sum(self.combine(hook))
+
+    # --- nearest marked vertex ---
+    def mark(self, v: int) -> None:
+        """O(log^2 N)"""
+        if self._marked[v]:
+            return
+        self._marked[v] = True
+        for c, d in self.ancestors(v):
+            heappush(self._heap[c], (d, v))
+
+    def unmark(self, v: int) -> None:
+        """Entries are dropped lazily by nearest. O(1)"""
+        self._marked[v] = False
+
+    def nearest(self, v: int) -> Optional[Tuple[int, int]]:
+        """(distance, vertex) of a nearest marked vertex, or None. Amortised O(log^2 N)"""
+        best = None
+        for c, d in self.ancestors(v):
+            h = self._heap[c]
+            while h and not self._marked[h[0][1]]:
+                heappop(h)
+            if h and (best is None or d + h[0][0] < best[0]):
+                best = (d + h[0][0], h[0][1])
+        return best
+
+
+if __name__ == "__main__":
+
+    def test():
+        import random
+        from collections import deque
+
+        for _ in range(200):
+            n = random.randint(1, 40)
+            edges = [(random.randrange(v), v) for v in range(1, n)]
+            weighted = random.random() < 0.5
+            weights = [random.randint(0, 4) if weighted else 1 for _ in edges]
+            cd = CentroidDecomposition(n, edges, weights)
+
+            adj = [[] for _ in range(n)]
+            for (a, b), w in zip(edges, weights):
+                adj[a].append((b, w))
+                adj[b].append((a, w))
+            D = []
+            for s in range(n):
+                d = [None] * n
+                d[s] = 0
+                q = deque([s])
+                while q:
+                    x = q.popleft()
+                    for y, w in adj[x]:
+                        if d[y] is None:
+                            d[y] = d[x] + w
+                            q.append(y)
+                D.append(d)
+
+            # centroid tree: depth O(log N), subtrees are halved
+            assert max(cd.depth) <= n.bit_length()
+            for v in range(n):
+                for c, d in cd.ancestors(v):
+                    assert d == D[v][c]
+
+            for k in (0, 1, 3, 10):
+                want = sum(D[u][v] <= k for u in range(n) for v in range(u + 1, n))
+                assert cd.count_paths_with_length_le(k) == want
+
+            marked = set()
+            for _ in range(60):
+                v = random.randrange(n)
+                t = random.randrange(3)
+                if t == 0:
+                    cd.mark(v)
+                    marked.add(v)
+                elif t == 1:
+                    cd.unmark(v)
+                    marked.discard(v)
+                else:
+                    res = cd.nearest(v)
+                    if not marked:
+                        assert res is None
+                    else:
+                        assert res[0] == min(D[v][u] for u in marked) and res[1] in marked
+                        assert D[v][res[1]] == res[0]
+
+        try:
+            CentroidDecomposition(4, [(0, 1), (1, 0), (2, 3)])
+            assert False
+        except ValueError:
+            pass
+        print("All tests passed!")
+
+    def bench(n=2 * 10**5):
+        import random
+        import time
+
+        edges = [(random.randrange(v), v) for v in range(1, n)]
+        t0 = time.perf_counter()
+        cd = CentroidDecomposition(n, edges)
+        t1 = time.perf_counter()
+        cnt = cd.count_paths_with_length_le(10)
+        t2 = time.perf_counter()
+        print(f"n = {n}: build {t1 - t0:.2f}s, count_paths_with_length_le {t2 - t1:.2f}s ({cnt})")
+
+    test()
+    # bench()
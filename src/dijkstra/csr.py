@@ -0,0 +1,571 @@
+from heapq import heappush as hpush, heappop as hpop
+from math import floor, inf, isfinite, nextafter
+from typing import Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+_I64 = np.iinfo(np.int64)
+
+
+class CSRGraph:
+    """
+    Directed graph with non-negative weights in CSR form, for repeated Dijkstra runs.
+
+    The out-edges of v are the slots off[v]:off[v + 1] of to / w (numpy arrays).
+    Weights are validated once here, and the lists the search loop walks are built on first use.
+    """
+
+    __slots__ = ("n", "off", "to", "w", "is_int", "_inf", "_lists", "_dense_csr")
+
+    def __init__(
+        self,
+        n: int,
+        u: Sequence[int],
+        v: Sequence[int],
+        w: Sequence[int],
+        directed: bool = True,
+    ):
+        """
+        :param u, v, w: the edges u -> v with weight w.
+        :param directed: if False, every edge is added in both directions.
+        """
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        w = np.asarray(w)
+        if not len(w):
+            w = w.astype(np.int64)  # np.asarray([]) is float64
+        m = len(u)
+        if len(v) != m or len(w) != m:
+            raise ValueError("u, v and w must have the same length")
+        if m and (min(u.min(), v.min()) < 0 or max(u.max(), v.max()) >= n):
+            raise IndexError("edge endpoint out of range")
+        if m and w.dtype.kind not in "iuf":
+            raise ValueError("weights must be numbers")
+        if m and not w.min() >= 0:  # also rejects nan
+            raise ValueError("Negative weight not allowed in Dijkstra")
+        if not directed:
+            u, v = np.concatenate((u, v)), np.concatenate((v, u))
+            w = np.concatenate((w, w))
+        perm = np.argsort(u, kind="stable")
+        off = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u, minlength=n), out=off[1:])
+        self._init(off, v[perm], w[perm])
+
+    def _init(self, off: np.ndarray, to: np.ndarray, w: np.ndarray) -> None:
+        self.n = len(off) - 1
+        self.off = off
+        self.to = to
+        self.w = w
+        self.is_int = w.dtype.kind in "iu"
+        # exceeds every distance; a Python int, so it may well not fit in int64
+        self._inf = (int(w.max()) if len(w) else 0) * len(w) + 1 if self.is_int else inf
+        self._lists = None
+        self._dense_csr = None
+
+    @classmethod
+    def from_csr(cls, off: np.ndarray, to: np.ndarray, w: np.ndarray) -> "CSRGraph":
+        """Wraps arrays already in CSR form (e.g. in shared memory) as they are: no copy, no validation."""
+        g = cls.__new__(cls)
+        g._init(off, to, w)
+        return g
+
+    @classmethod
+    def from_adj(cls, G: Sequence[Iterable[Tuple[int, int]]]) -> "CSRGraph":
+        """From the G[v] = [(nv, w), ...] lists dijkstra/simple.py takes."""
+        u = [v for v, row in enumerate(G) for _ in row]
+        v = [nv for row in G for nv, _ in row]
+        w = [we for row in G for _, we in row]
+        return cls(len(G), u, v, w)
+
+    def _as_lists(self) -> Tuple[List[List[int]], list]:
+        """Per-vertex target / weight lists: zip over two short lists beats indexing flat ones."""
+        if self._lists is None:
+            off, to, w = self.off.tolist(), self.to.tolist(), self.w.tolist()
+            adj_to = [to[off[v] : off[v + 1]] for v in range(self.n)]
+            adj_w = [w[off[v] : off[v + 1]] for v in range(self.n)]
+            self._lists = (adj_to, adj_w)
+        return self._lists
+
+    def _dense_arrays(self) -> Tuple[List[int], np.ndarray, np.ndarray]:
+        """The CSR with parallel edges merged into the lightest, so fancy-index assignment is safe."""
+        if self._dense_csr is None:
+            src = np.repeat(np.arange(self.n), np.diff(self.off))
+            order = np.lexsort((self.w, self.to, src))
+            src, to, w = src[order], self.to[order], self.w[order]
+            keep = np.ones(len(src), dtype=np.bool_)
+            keep[1:] = (src[1:] != src[:-1]) | (to[1:] != to[:-1])
+            off = np.zeros(self.n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(src[keep], minlength=self.n), out=off[1:])
+            self._dense_csr = (off.tolist(), to[keep], w[keep])
+        return self._dense_csr
+
+    def dijkstra(
+        self,
+        sources: Iterable[int],
+        targets: Optional[Iterable[int]] = None,
+        bound=None,
+        heap: str = "binary",
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Multi-source Dijkstra.
+
+        :param sources: vertices at distance 0.
+        :param targets: stop as soon as all of them are settled.
+        :param bound: do not settle vertices farther than bound.
+        :param heap: the priority queue.
+            - "binary": heapq with lazy deletion, O((V + E) log E). The default.
+            - "radix": monotone radix heap, integer weights only, O(E + V log C) for distances up to C.
+            - "indexed": binary heap with decrease-key, at most V entries, O((V + E) log V).
+            - "dense": no heap, a numpy argmin over all vertices per settled vertex, O(V^2 + E)
+              in O(V) numpy calls; the fastest for (near-)complete graphs.
+        :return: (dist, par) as numpy arrays; dist is -1 and par is -1 for vertices that were not
+            settled (unreachable, beyond bound, or left over by the early exit); par is -1 at sources too.
+            Integer distances are int64, or an object array of Python ints if one does not fit.
+        """
+        n = self.n
+        if heap not in _RUNS and heap != "dense":
+            raise ValueError(f"unknown heap {heap!r}, expected one of {', '.join(_RUNS)}, dense")
+        if heap == "radix" and not self.is_int:
+            raise ValueError("the radix heap needs integer weights")
+        sources = list(sources)
+        for s in sources:
+            if not 0 <= s < n:
+                raise IndexError(s)
+        # the initial distance doubles as the bound: longer relaxations are rejected for free
+        if bound is not None and bound < 0:
+            raise ValueError("bound must be non-negative")
+        if bound is None or not isfinite(bound):  # inf: no bound
+            unseen = self._inf
+        elif self.is_int:
+            unseen = min(floor(bound) + 1, self._inf)
+        else:
+            unseen = nextafter(bound, inf)
+
+        left = 0
+        is_target = None
+        if targets is not None:
+            is_target = [False] * n
+            for t in targets:
+                if not 0 <= t < n:
+                    raise IndexError(t)
+                if not is_target[t]:
+                    is_target[t] = True
+                    left += 1
+            if left == 0:
+                sources = []
+        sources = list(set(sources))
+
+        if heap == "dense":
+            return self._dense(sources, is_target, left, unseen)
+
+        dist = [unseen] * n
+        par = [-1] * n
+        for s in sources:
+            dist[s] = 0
+        adj_to, adj_w = self._as_lists()
+        pending = _RUNS[heap](adj_to, adj_w, self.is_int, dist, par, sources, is_target, left)
+        # vertices still queued were reached but not settled
+        for v in pending:
+            dist[v] = unseen
+            par[v] = -1
+
+        if self.is_int and unseen > _I64.max:
+            # the search ran on Python ints; only the sentinel, or the longest distances, overflow int64
+            dist = [-1 if d == unseen else d for d in dist]
+            try:
+                res = np.array(dist, dtype=np.int64)
+            except OverflowError:
+                res = np.array(dist, dtype=object)
+            return res, np.array(par, dtype=np.int64)  # par is still -1 wherever dist is
+        res = np.array(dist, dtype=np.int64 if self.is_int else np.float64)
+        unreached = res == unseen
+        res[unreached] = -1
+        par_arr = np.array(par, dtype=np.int64)
+        par_arr[unreached] = -1
+        return res, par_arr
+
+    def _dense(self, sources: List[int], is_target: Optional[List[bool]], left: int, unseen):
+        off, to, w = self._dense_arrays()
+        dt = np.int64 if self.is_int else np.float64
+        if self.is_int and unseen + (int(w.max()) if len(w) else 0) > _I64.max:
+            # d + w could wrap around in int64: Python ints in object arrays instead, several times slower
+            dt = object
+            w = w.astype(object)
+        dist = np.full(self.n, unseen, dtype=dt)
+        par = np.full(self.n, -1, dtype=np.int64)
+        dist[sources] = 0
+        cand = dist.copy()  # dist of the unsettled vertices, unseen for the settled ones
+        while True:
+            v = int(cand.argmin())
+            d = cand[v]
+            if d >= unseen:
+                break
+            cand[v] = unseen
+            if is_target is not None and is_target[v]:
+                left -= 1
+                if left == 0:
+                    break
+            a, b = off[v], off[v + 1]
+            if a == b:
+                continue
+            nb = to[a:b]
+            nd = d + w[a:b]
+            better = nd < dist[nb]  # never true for a settled vertex
+            nb, nd = nb[better], nd[better]
+            dist[nb] = nd
+            cand[nb] = nd
+            par[nb] = v
+
+        unreached = (dist >= unseen) | (cand < unseen)
+        dist[unreached] = -1
+        par[unreached] = -1
+        if dt is object:
+            try:
+                dist = dist.astype(np.int64)
+            except OverflowError:
+                pass
+        return dist, par
+
+
+def _run_binary(adj_to, adj_w, is_int, dist, par, sources, is_target, left) -> List[int]:
+    if is_int:
+        # packed heap keys d << sh | v: one int per entry instead of a tuple
+        n = len(dist)
+        sh = n.bit_length()
+        mask = (1 << sh) - 1
+        hq = sorted(sources)
+        while hq:
+            key = hpop(hq)
+            d, v = key >> sh, key & mask
+            if d > dist[v]:
+                continue
+            if is_target is not None and is_target[v]:
+                left -= 1
+                if left == 0:
+                    break
+            for nv, we in zip(adj_to[v], adj_w[v]):
+                nd = d + we
+                if nd < dist[nv]:
+                    dist[nv] = nd
+                    par[nv] = v
+                    hpush(hq, nd << sh | nv)
+        return [key & mask for key in hq if key >> sh == dist[key & mask]]
+
+    hq = [(0, s) for s in sorted(sources)]
+    while hq:
+        d, v = hpop(hq)
+        if d > dist[v]:
+            continue
+        if is_target is not None and is_target[v]:
+            left -= 1
+            if left == 0:
+                break
+        for nv, we in zip(adj_to[v], adj_w[v]):
+            nd = d + we
+            if nd < dist[nv]:
+                dist[nv] = nd
+                par[nv] = v
+                hpush(hq, (nd, nv))
+    return [v for d, v in hq if d == dist[v]]
+
+
+def _run_radix(adj_to, adj_w, is_int, dist, par, sources, is_target, left) -> List[int]:
+    """
+    Monotone radix heap: a key d lives in bucket (d ^ last).bit_length(), where last is the last
+    popped key. Popping refills bucket 0 from the first non-empty bucket, and every entry moves
+    to a strictly lower bucket each time, so the total work is O(E + V log C).
+    """
+    n = len(dist)
+    sh = n.bit_length()
+    mask = (1 << sh) - 1
+    buckets: List[List[int]] = [[] for _ in range(max(dist).bit_length() + 1)]
+    b0 = buckets[0]
+    b0.extend(sources)  # keys 0 << sh | s
+    size = len(sources)
+    last = 0
+    while size:
+        if not b0:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            moved = buckets[i]
+            buckets[i] = []
+            # stale entries are dropped instead of moved
+            live = [key for key in moved if key >> sh == dist[key & mask]]
+            size -= len(moved) - len(live)
+            if not live:
+                continue
+            last = min(live) >> sh
+            for key in live:
+                buckets[((key >> sh) ^ last).bit_length()].append(key)
+        key = b0.pop()
+        size -= 1
+        v = key & mask
+        d = key >> sh
+        if d > dist[v]:
+            continue
+        if is_target is not None and is_target[v]:
+            left -= 1
+            if left == 0:
+                break
+        for nv, we in zip(adj_to[v], adj_w[v]):
+            nd = d + we
+            if nd < dist[nv]:
+                dist[nv] = nd
+                par[nv] = v
+                buckets[(nd ^ last).bit_length()].append(nd << sh | nv)
+                size += 1
+    return [key & mask for bucket in buckets for key in bucket if key >> sh == dist[key & mask]]
+
+
+def _run_indexed(adj_to, adj_w, is_int, dist, par, sources, is_target, left) -> List[int]:
+    """Binary heap of vertices keyed by dist, with pos[v] for decrease-key: at most V entries."""
+    hv = sorted(sources)  # all keys 0: already a heap
+    pos = [-1] * len(dist)
+    for i, s in enumerate(hv):
+        pos[s] = i
+
+    def sift_up(i: int) -> None:
+        v = hv[i]
+        d = dist[v]
+        while i:
+            p = (i - 1) >> 1
+            pv = hv[p]
+            if dist[pv] <= d:
+                break
+            hv[i] = pv
+            pos[pv] = i
+            i = p
+        hv[i] = v
+        pos[v] = i
+
+    def pop() -> int:
+        top = hv[0]
+        pos[top] = -1
+        v = hv.pop()
+        if not hv:
+            return top
+        d = dist[v]
+        size = len(hv)
+        i = 0
+        while True:
+            c = 2 * i + 1
+            if c >= size:
+                break
+            if c + 1 < size and dist[hv[c + 1]] < dist[hv[c]]:
+                c += 1
+            cv = hv[c]
+            if d <= dist[cv]:
+                break
+            hv[i] = cv
+            pos[cv] = i
+            i = c
+        hv[i] = v
+        pos[v] = i
+        return top
+
+    while hv:
+        v = pop()
+        d = dist[v]
+        if is_target is not None and is_target[v]:
+            left -= 1
+            if left == 0:
+                break
+        for nv, we in zip(adj_to[v], adj_w[v]):
+            nd = d + we
+            if nd < dist[nv]:
+                dist[nv] = nd
+                par[nv] = v
+                if pos[nv] == -1:
+                    pos[nv] = len(hv)
+                    hv.append(nv)
+                sift_up(pos[nv])
+    return hv
+
+
+_RUNS = {"binary": _run_binary, "radix": _run_radix, "indexed": _run_indexed}
+
+
+def restore_path(par: np.ndarray, tv: int) -> List[int]:
+    """Path from its source to tv along par (-1 at the source); [] if tv was not settled."""
+    ans = []
+    cur = tv
+    while cur != -1:
+        ans.append(cur)
+        cur = int(par[cur])
+    return ans[::-1]
+
+
+if __name__ == "__main__":
+
+    def grid_graph(h: int, w: int, rng: np.random.Generator, max_w: int = 100) -> CSRGraph:
+        """h x w grid with random weights in both directions: a crude road network."""
+        idx = np.arange(h * w).reshape(h, w)
+        u = np.concatenate((idx[:, :-1].ravel(), idx[:-1, :].ravel()))
+        v = np.concatenate((idx[:, 1:].ravel(), idx[1:, :].ravel()))
+        u, v = np.concatenate((u, v)), np.concatenate((v, u))
+        return CSRGraph(h * w, u, v, rng.integers(1, max_w + 1, len(u)))
+
+    HEAPS = ("binary", "radix", "indexed", "dense")
+
+    def test():
+        import random
+        from simple import dijkstra
+
+        for _ in range(300):
+            n = random.randint(1, 30)
+            m = random.randint(0, 80)
+            is_float = random.random() < 0.3
+            edges = [
+                (random.randrange(n), random.randrange(n), random.random() * 5 if is_float else random.randint(0, 9))
+                for _ in range(m)
+            ]
+            G = [[] for _ in range(n)]
+            for a, b, c in edges:
+                G[a].append((b, c))
+            g = CSRGraph.from_adj(G) if edges else CSRGraph(n, [], [], [])
+
+            sources = random.sample(range(n), random.randint(1, min(3, n)))
+            G2 = G + [[(s, 0) for s in sources]]  # super source
+            want, _ = dijkstra(G2, n)
+            want = want[:n]
+
+            for heap in HEAPS:
+                if heap == "radix" and is_float:
+                    continue
+                dist, par = g.dijkstra(sources, heap=heap)
+                for x in range(n):
+                    if want[x] == float("inf"):
+                        assert dist[x] == -1 and par[x] == -1
+                    else:
+                        assert abs(dist[x] - want[x]) < 1e-9
+                        p = restore_path(par, x)
+                        assert p[0] in sources and p[-1] == x
+                        cost = sum(min(c for b, c in G[a] if b == nb) for a, nb in zip(p, p[1:]))
+                        assert abs(cost - want[x]) < 1e-9
+
+                bound = random.randint(0, 20)
+                dist, _ = g.dijkstra(sources, bound=bound, heap=heap)
+                for x in range(n):
+                    assert (dist[x] == -1) == (want[x] > bound)
+
+                targets = random.sample(range(n), random.randint(1, n))
+                dist, par = g.dijkstra(sources, targets=targets, heap=heap)
+                for x in range(n):
+                    # settled vertices are exact, the targets are always settled if reachable
+                    assert dist[x] == -1 or abs(dist[x] - want[x]) < 1e-9
+                    if x in targets:
+                        assert (dist[x] == -1) == (want[x] == float("inf"))
+
+        # weights near int64: the sentinel, and then the distances themselves, no longer fit
+        G = [[(1, 10**18)] * 10, [(2, 5 * 10**18)], [(3, 5 * 10**18)], []]
+        g = CSRGraph.from_adj(G)
+        want, _ = dijkstra(G, 0)
+        for heap in HEAPS:
+            for targets in (None, [1], [3]):
+                dist, par = g.dijkstra([0], targets=targets, heap=heap)
+                got = [int(d) if d != -1 else inf for d in dist.tolist()]
+                assert all(a == b or a == inf for a, b in zip(got, want)) and got[1] == 10**18
+                assert dist.dtype == (np.int64 if targets == [1] else object)
+                assert restore_path(par, 1) == [0, 1]
+            dist, _ = g.dijkstra([0], bound=10**19, heap=heap)
+            assert dist.tolist() == [0, 10**18, 6 * 10**18, -1] and dist.dtype == np.int64
+            dist, _ = g.dijkstra([0], bound=inf, heap=heap)
+            assert dist.tolist() == [0, 10**18, 6 * 10**18, 11 * 10**18]
+
+        # all modes agree on random graphs with weights near 2**62, so paths of a few edges overflow int64
+        for _ in range(50):
+            n = random.randint(1, 12)
+            edges = [(random.randrange(n), random.randrange(n), 2**62 - random.randint(0, 9)) for _ in range(30)]
+            G = [[] for _ in range(n)]
+            for a, b, c in edges:
+                G[a].append((b, c))
+            g = CSRGraph.from_adj(G)
+            sources = random.sample(range(n), random.randint(1, min(2, n)))
+            want, _ = dijkstra(G + [[(s, 0) for s in sources]], n)
+            want = [-1 if d == inf else d for d in want[:n]]
+            for heap in HEAPS:
+                dist, _ = g.dijkstra(sources, heap=heap)
+                assert dist.tolist() == want
+                bound = random.choice((2**62, 2**63, 3 * 2**62))
+                dist, _ = g.dijkstra(sources, bound=bound, heap=heap)
+                assert dist.tolist() == [d if d <= bound else -1 for d in want]
+
+        for bad in ([-1], [float("nan")]):
+            try:
+                CSRGraph(2, [0], [1], bad)
+                assert False
+            except ValueError:
+                pass
+        for heap in ("fibonacci", "radix"):
+            try:
+                CSRGraph(2, [0], [1], [0.5]).dijkstra([0], heap=heap)
+                assert False
+            except ValueError:
+                pass
+        print("All tests passed!")
+
+    def bench(h=1000, w=1000):
+        import time
+        from simple import dijkstra
+
+        rng = np.random.default_rng(0)
+        t = time.perf_counter()
+        g = grid_graph(h, w, rng)
+        print(f"{h}x{w} grid, {len(g.to)} arcs: build {time.perf_counter() - t:.2f}s")
+        off, to, wt = g.off.tolist(), g.to.tolist(), g.w.tolist()
+        G = [list(zip(to[off[v] : off[v + 1]], wt[off[v] : off[v + 1]])) for v in range(g.n)]
+
+        t = time.perf_counter()
+        want, _ = dijkstra(G, 0)
+        print(f"simple.dijkstra            {time.perf_counter() - t:.2f}s")
+        del G
+        t = time.perf_counter()
+        g._as_lists()
+        print(f"CSRGraph lists (once)      {time.perf_counter() - t:.2f}s")
+        t = time.perf_counter()
+        dist, _ = g.dijkstra([0])
+        print(f"CSRGraph.dijkstra          {time.perf_counter() - t:.2f}s")
+        assert dist.tolist() == want
+        mid = (h // 2) * w + w // 2
+        t = time.perf_counter()
+        dist, _ = g.dijkstra([mid], targets=[mid + 10 * w + 10])
+        print(f"  with a target 20 hops away   {time.perf_counter() - t:.3f}s")
+        t = time.perf_counter()
+        g.dijkstra([mid], bound=1000)
+        print(f"  with bound = 1000            {time.perf_counter() - t:.3f}s")
+        t = time.perf_counter()
+        g.dijkstra(range(0, g.n, g.n // 100))
+        print(f"  100 sources                  {time.perf_counter() - t:.2f}s")
+
+    def bench_heaps():
+        """Which heap= wins where."""
+        import time
+
+        rng = np.random.default_rng(0)
+        n = 2000
+        u, v = np.divmod(np.arange(n * n), n)
+        cases = {
+            "grid 500x500, w in [1, 100]": grid_graph(500, 500, rng),
+            "grid 500x500, w in [1, 3]": grid_graph(500, 500, rng, 3),
+            "grid 100x100, w in [1, 100]": grid_graph(100, 100, rng),
+            f"complete n = {n}, w < 10**6": CSRGraph(n, u, v, rng.integers(0, 10**6, n * n)),
+        }
+        print(f"{'':30s}" + "".join(f"{h:>10s}" for h in HEAPS))
+        for name, g in cases.items():
+            g._as_lists()
+            g._dense_arrays()
+            row, want = [], None
+            for heap in HEAPS:
+                if heap == "dense" and g.n > 10**5:  # 250k argmins of 250k: minutes
+                    row.append(f"{'-':>10s}")
+                    continue
+                t = time.perf_counter()
+                dist, _ = g.dijkstra([0], heap=heap)
+                row.append(f"{time.perf_counter() - t:9.2f}s")
+                want = dist if want is None else want
+                assert (dist == want).all()
+            print(f"{name:30s}" + "".join(row))
+
+    test()
+    # bench()
+    # bench_heaps()
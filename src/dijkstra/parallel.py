@@ -0,0 +1,263 @@
+from multiprocessing import get_context, shared_memory
+from queue import SimpleQueue
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import os
+import numpy as np
+from csr import CSRGraph  # the sibling snippet: its search loop runs in the workers
+
+Graph = Sequence[Sequence[Tuple[int, int]]]  # G[v] = [(nv, w), ...], as in dijkstra/simple.py
+
+# per worker process: the CSRGraph over the shared CSR, and the shared output matrix (matrix mode only)
+_state = None
+
+
+def _to_csr(G) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(off, to, w) arrays from G lists, or from anything with .off / .to / .w arrays (e.g. csr.py CSRGraph)."""
+    if all(hasattr(G, a) for a in ("off", "to", "w")):
+        off, to, w = np.asarray(G.off, dtype=np.int64), np.asarray(G.to, dtype=np.int64), np.asarray(G.w)
+    else:
+        off = np.zeros(len(G) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in G], out=off[1:])
+        to = np.array([nv for row in G for nv, _ in row], dtype=np.int64)
+        w = np.array([we for row in G for _, we in row])
+    if not len(w):
+        w = w.astype(np.int64)
+    if w.dtype.kind not in "iuf":
+        raise ValueError("weights must be numbers")
+    if len(w) and not w.min() >= 0:
+        raise ValueError("Negative weight not allowed in Dijkstra")
+    return off, to, w
+
+
+def _attach(name: str, shape, dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    # workers share the parent's resource tracker, which already knows the block; the parent unlinks it
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _init_worker(graph_spec, out_spec) -> None:
+    """Attaches the shared CSR (and output matrix) and builds the search lists once per worker."""
+    global _state
+    shms = []
+    arrs = []
+    for spec in graph_spec:
+        shm, a = _attach(*spec)
+        shms.append(shm)
+        arrs.append(a)
+    g = CSRGraph.from_csr(*arrs)
+    g._as_lists()
+    out = None
+    if out_spec is not None:
+        shm, out = _attach(*out_spec)
+        shms.append(shm)
+    _state = (g, out, shms)
+
+
+def _fill_rows(task: Tuple[int, List[int]]) -> int:
+    """Matrix mode: writes the rows lo, lo + 1, ... of the shared output. Returns how many."""
+    lo, srcs = task
+    g, out, _ = _state
+    for i, s in enumerate(srcs):
+        out[lo + i] = g.dijkstra([s])[0]
+    return len(srcs)
+
+
+def _rows(srcs: List[int]) -> List[Tuple[int, np.ndarray]]:
+    """Stream mode: the rows go back to the parent through the pool's pipe."""
+    g = _state[0]
+    return [(s, g.dijkstra([s])[0]) for s in srcs]
+
+
+def dijkstra_many(
+    G: Graph,
+    sources: Iterable[int],
+    workers: Optional[int] = None,
+    stream: bool = False,
+    chunksize: int = 8,
+) -> Union[np.ndarray, Iterator[Tuple[int, np.ndarray]]]:
+    """
+    Single-source Dijkstra from every vertex of sources, on a pool of worker processes.
+
+    The CSR of G lives in multiprocessing.shared_memory, so it is copied to the workers once
+    (each worker still builds its own Python lists from it, about 70 bytes per edge).
+
+    :param G: G[v] = [(nv, w), ...] lists, or an object with .off / .to / .w CSR arrays.
+    :param workers: number of processes (default os.cpu_count()); 1 runs in this process.
+    :param stream: if False, returns the len(sources) x N distance matrix (workers write their rows
+        straight into shared memory). If True, returns an iterator of (source, dist) rows in
+        completion order; at most 2 * workers tasks are queued or finished but not yet consumed,
+        so only about 2 * workers * chunksize rows are alive at a time, however slow the consumer.
+    :param chunksize: sources per task.
+    :return: distances as int64 (or float64 for float weights), -1 where unreachable.
+        Integer distances must fit in int64.
+    """
+    off, to, w = _to_csr(G)
+    n = len(off) - 1
+    sources = list(sources)
+    for s in sources:
+        if not 0 <= s < n:
+            raise ValueError(s)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError("workers and chunksize must be positive")
+    dt = np.int64 if w.dtype.kind in "iu" else np.float64
+    chunks = [(lo, sources[lo : lo + chunksize]) for lo in range(0, len(sources), chunksize)]
+
+    if workers == 1:
+        g = CSRGraph.from_csr(off, to, w)
+        rows = ((s, g.dijkstra([s])[0]) for s in sources)
+        if stream:
+            return rows
+        res = np.empty((len(sources), n), dtype=dt)
+        for i, (_, row) in enumerate(rows):
+            res[i] = row
+        return res
+
+    if stream:
+        return _stream(off, to, w, chunks, workers)
+    return _matrix(off, to, w, chunks, workers, len(sources), dt)
+
+
+def _share(arrays: Sequence[np.ndarray]):
+    """Copies arrays into new shared memory blocks; returns the blocks and the specs to attach them."""
+    shms, specs = [], []
+    try:
+        for a in arrays:
+            shm = shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1))
+            shms.append(shm)
+            np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)[...] = a
+            specs.append((shm.name, a.shape, a.dtype))
+    except BaseException:
+        _release(shms)
+        raise
+    return shms, specs
+
+
+def _release(shms) -> None:
+    for shm in shms:
+        shm.close()
+        shm.unlink()
+
+
+def _matrix(off, to, w, chunks, workers, k, dt) -> np.ndarray:
+    shms, specs = _share((off, to, w))
+    try:
+        out_shm = shared_memory.SharedMemory(create=True, size=max(k * (len(off) - 1) * 8, 1))
+        shms.append(out_shm)
+        out_spec = (out_shm.name, (k, len(off) - 1), dt)
+        with get_context().Pool(workers, _init_worker, (specs, out_spec)) as pool:
+            done = sum(pool.imap_unordered(_fill_rows, chunks))
+        assert done == k
+        return np.ndarray(out_spec[1], dtype=dt, buffer=out_shm.buf).copy()
+    finally:
+        _release(shms)
+
+
+def _stream(off, to, w, chunks, workers) -> Iterator[Tuple[int, np.ndarray]]:
+    # a window of tasks instead of imap_unordered, which submits everything at once
+    # and buffers every finished chunk in the parent however slowly they are consumed
+    shms, specs = _share((off, to, w))
+    try:
+        with get_context().Pool(workers, _init_worker, (specs, None)) as pool:
+            done = SimpleQueue()  # results (or exceptions) of finished tasks
+            todo = iter(chunks)
+            in_flight = 0
+
+            def submit() -> None:
+                nonlocal in_flight
+                for _, srcs in todo:
+                    pool.apply_async(_rows, (srcs,), callback=done.put, error_callback=done.put)
+                    in_flight += 1
+                    return
+
+            for _ in range(2 * workers):
+                submit()
+            while in_flight:
+                rows = done.get()
+                in_flight -= 1
+                if isinstance(rows, BaseException):
+                    raise rows
+                submit()
+                yield from rows
+    finally:
+        _release(shms)
+
+
+if __name__ == "__main__":
+
+    def grid(H: int, W: int, rng, hi: int = 100) -> List[List[Tuple[int, int]]]:
+        G = [[] for _ in range(H * W)]
+        for i in range(H):
+            for j in range(W):
+                for ni, nj in ((i + 1, j), (i - 1, j), (i, j + 1), (i, j - 1)):
+                    if 0 <= ni < H and 0 <= nj < W:
+                        G[i * W + j].append((ni * W + nj, rng.randint(1, hi)))
+        return G
+
+    def test():
+        import random
+        import time
+        from simple import dijkstra
+
+        for _ in range(20):
+            N = random.randint(1, 40)
+            is_float = random.random() < 0.3
+            G = [[] for _ in range(N)]
+            for _ in range(random.randint(0, 100)):
+                we = random.random() * 5 if is_float else random.randint(0, 9)
+                G[random.randrange(N)].append((random.randrange(N), we))
+            sources = [random.randrange(N) for _ in range(random.randint(0, 12))]
+            want = []
+            for s in sources:
+                d, _ = dijkstra(G, s)
+                want.append([-1 if x == float("inf") else x for x in d])
+
+            for workers in (1, 3):
+                mat = dijkstra_many(G, sources, workers=workers, chunksize=random.randint(1, 4))
+                assert mat.shape == (len(sources), N)
+                assert np.allclose(mat, np.array(want).reshape(len(sources), N))
+                rows = dict(dijkstra_many(G, sources, workers=workers, stream=True, chunksize=2))
+                for s, row in zip(sources, want):
+                    assert np.allclose(rows[s], row)
+
+        # in-process streams are independent: a second call does not disturb the first
+        a = dijkstra_many([[(1, 1)], []], [0, 1], workers=1, stream=True)
+        b = dijkstra_many([[(1, 5)], [(0, 5)]], [0, 1], workers=1, stream=True)
+        assert [(s, row.tolist()) for s, row in a] == [(0, [0, 1]), (1, [-1, 0])]
+        assert [(s, row.tolist()) for s, row in b] == [(0, [0, 5]), (1, [5, 0])]
+
+        # a slow consumer: the workers stop after 2 * workers tasks instead of running ahead
+        G = grid(20, 20, random)
+        it = dijkstra_many(G, range(200), workers=2, stream=True, chunksize=2)
+        seen = [next(it)]
+        time.sleep(1)
+        state = it.gi_frame.f_locals
+        assert state["in_flight"] <= 4 and state["done"].qsize() <= 4
+        seen += list(it)
+        assert sorted(s for s, _ in seen) == list(range(200))
+        print("All tests passed!")
+
+    def bench(H=300, W=300, k=64):
+        import random
+        import time
+
+        rng = random.Random(0)
+        G = grid(H, W, rng)
+        sources = rng.sample(range(H * W), k)
+        print(f"{H}x{W} grid, {k} sources, {os.cpu_count()} CPUs")
+        base = None
+        for workers in (1, 2, 4, 8):
+            t = time.perf_counter()
+            mat = dijkstra_many(G, sources, workers=workers)
+            el = time.perf_counter() - t
+            base = base or el
+            print(f"workers = {workers}: {el:6.2f}s  speedup x{base / el:.2f}")
+        t = time.perf_counter()
+        peak = 0
+        for s, row in dijkstra_many(G, sources, workers=4, stream=True):
+            peak = max(peak, int(row.max()))
+        print(f"stream, workers = 4: {time.perf_counter() - t:6.2f}s  (max distance {peak})")
+
+    test()
+    # bench()
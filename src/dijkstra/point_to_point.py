@@ -0,0 +1,230 @@
+from heapq import heappush as hpush, heappop as hpop
+from math import hypot, inf
+from typing import Callable, List, Sequence, Tuple
+
+Graph = Sequence[Sequence[Tuple[int, int]]]  # G[v] = [(nv, w), ...], as in dijkstra/simple.py
+
+
+def reverse_graph(G: Graph) -> List[List[Tuple[int, int]]]:
+    """RG[nv] = [(v, w), ...] for every edge v -> nv of G. O(V + E)"""
+    RG: List[List[Tuple[int, int]]] = [[] for _ in range(len(G))]
+    for v, row in enumerate(G):
+        for nv, w in row:
+            RG[nv].append((v, w))
+    return RG
+
+
+def restore_path(par: list, tv: int) -> List[int]:
+    ans = []
+    cur = tv
+    while cur is not None:
+        ans.append(cur)
+        cur = par[cur]
+    return ans[::-1]
+
+
+def shortest_path(G: Graph, s: int, t: int, RG: Graph = None) -> Tuple[float, List[int]]:
+    """
+    Bidirectional Dijkstra from s and (over RG) from t. Returns (dist, path), or (inf, []).
+
+    Each step advances the side with the smaller heap top; the search stops once
+    top_forward + top_backward >= mu, the best s-t length seen so far. On road-like graphs
+    the two balls of radius ~dist/2 settle far fewer vertices than a single ball of radius dist.
+
+    :param RG: reverse_graph(G); pass it in when answering many queries on the same G.
+    """
+    N = len(G)
+    if not (0 <= s < N and 0 <= t < N):
+        raise ValueError
+    if s == t:
+        return 0, [s]
+    if RG is None:
+        RG = reverse_graph(G)
+
+    graphs = (G, RG)
+    dists = ([inf] * N, [inf] * N)
+    pars = ([None] * N, [None] * N)
+    heaps = ([(0, s)], [(0, t)])
+    dists[0][s] = 0
+    dists[1][t] = 0
+    mu = inf
+    meet = None  # (side, v, nv): v settled on side, nv reached from the other side
+
+    while heaps[0] and heaps[1]:
+        tf, tb = heaps[0][0][0], heaps[1][0][0]
+        if tf + tb >= mu:
+            break
+        side = 0 if tf <= tb else 1
+        hq, dist, par, other = heaps[side], dists[side], pars[side], dists[1 - side]
+        d, v = hpop(hq)
+        if d > dist[v]:
+            continue
+        for nv, w in graphs[side][v]:
+            if w < 0:
+                raise ValueError("Negative weight not allowed in Dijkstra")
+            nd = d + w
+            if nd < dist[nv]:
+                dist[nv] = nd
+                par[nv] = v
+                hpush(hq, (nd, nv))
+            if nd + other[nv] < mu:
+                mu = nd + other[nv]
+                meet = (side, v, nv)
+
+    if meet is None:
+        return inf, []
+    side, v, nv = meet
+    # the meeting edge v -> nv joins the settled tree of `side` to the tree of the other side
+    head = restore_path(pars[side], v)
+    tail = restore_path(pars[1 - side], nv)
+    if side == 0:
+        return mu, head + tail[::-1]
+    return mu, tail + head[::-1]
+
+
+def astar(G: Graph, s: int, t: int, h: Callable[[int], float]) -> Tuple[float, List[int]]:
+    """
+    A* from s to t. Returns (dist, path), or (inf, []).
+
+    :param h: admissible heuristic, h(v) <= dist(v, t). With a consistent one
+        (h(v) <= w + h(nv) for every edge) each vertex is expanded at most once;
+        h = 0 is plain Dijkstra with an early exit.
+    """
+    N = len(G)
+    if not (0 <= s < N and 0 <= t < N):
+        raise ValueError
+    dist = [inf] * N
+    par = [None] * N
+    dist[s] = 0
+    hq = [(h(s), 0, s)]
+    while hq:
+        _, d, v = hpop(hq)
+        if d > dist[v]:
+            continue
+        if v == t:
+            return d, restore_path(par, t)
+        for nv, w in G[v]:
+            if w < 0:
+                raise ValueError("Negative weight not allowed in Dijkstra")
+            nd = d + w
+            if nd < dist[nv]:
+                dist[nv] = nd
+                par[nv] = v
+                hpush(hq, (nd + h(nv), nd, nv))
+    return inf, []
+
+
+# --- heuristics for grids with vertex id i * W + j ---
+def manhattan(W: int, t: int, unit: float = 1) -> Callable[[int], float]:
+    """unit * (|di| + |dj|) to t; admissible on 4-neighbour grids whose steps cost at least unit."""
+    ti, tj = divmod(t, W)
+
+    def h(v: int) -> float:
+        i, j = divmod(v, W)
+        return unit * (abs(i - ti) + abs(j - tj))
+
+    return h
+
+
+def euclidean(W: int, t: int, unit: float = 1) -> Callable[[int], float]:
+    """unit * straight-line distance to t; admissible when a move of length l costs at least unit * l."""
+    ti, tj = divmod(t, W)
+
+    def h(v: int) -> float:
+        i, j = divmod(v, W)
+        return unit * hypot(i - ti, j - tj)
+
+    return h
+
+
+if __name__ == "__main__":
+
+    def grid(H: int, W: int, rng, lo: int, hi: int, diagonal: bool = False) -> List[List[Tuple[int, int]]]:
+        """H x W grid, random weights in [lo, hi] per direction (diagonal moves cost sqrt 2 as much)."""
+        dirs = [(1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1)]
+        if diagonal:
+            dirs += [(a, b, 2**0.5) for a in (1, -1) for b in (1, -1)]
+        G = [[] for _ in range(H * W)]
+        for i in range(H):
+            for j in range(W):
+                for di, dj, f in dirs:
+                    ni, nj = i + di, j + dj
+                    if 0 <= ni < H and 0 <= nj < W:
+                        G[i * W + j].append((ni * W + nj, rng.randint(lo, hi) * f))
+        return G
+
+    def test():
+        import random
+        from simple import dijkstra
+
+        def check(G, s, t, res, want):
+            d, path = res
+            if want == inf:
+                assert d == inf and path == []
+                return
+            assert abs(d - want) < 1e-9 and path[0] == s and path[-1] == t
+            assert abs(sum(min(w for b, w in G[a] if b == nb) for a, nb in zip(path, path[1:])) - want) < 1e-9
+
+        for _ in range(300):
+            N = random.randint(1, 30)
+            G = [[] for _ in range(N)]
+            for _ in range(random.randint(0, 80)):
+                G[random.randrange(N)].append((random.randrange(N), random.randint(0, 9)))
+            RG = reverse_graph(G)
+            for _ in range(5):
+                s, t = random.randrange(N), random.randrange(N)
+                want = dijkstra(G, s)[0][t]
+                check(G, s, t, shortest_path(G, s, t, RG), want)
+                check(G, s, t, astar(G, s, t, lambda v: 0), want)
+
+        for diagonal in (False, True):
+            H, W = random.randint(1, 12), random.randint(1, 12)
+            G = grid(H, W, random, 3, 7, diagonal)
+            for _ in range(30):
+                s, t = random.randrange(H * W), random.randrange(H * W)
+                want = dijkstra(G, s)[0][t]
+                check(G, s, t, astar(G, s, t, euclidean(W, t, 3)), want)
+                if not diagonal:
+                    check(G, s, t, astar(G, s, t, manhattan(W, t, 3)), want)
+                check(G, s, t, shortest_path(G, s, t), want)
+        print("All tests passed!")
+
+    def bench(H=700, W=700, queries=20):
+        import random
+        import time
+        from simple import dijkstra
+
+        class Counting(list):
+            """Counts the adjacency reads, i.e. the vertices settled."""
+
+            reads = 0
+
+            def __getitem__(self, v):
+                Counting.reads += 1
+                return list.__getitem__(self, v)
+
+        rng = random.Random(0)
+        G = grid(H, W, rng, 10, 20)
+        RG = reverse_graph(G)
+        CG, CRG = Counting(G), Counting(RG)
+        qs = [(rng.randrange(H * W), rng.randrange(H * W)) for _ in range(queries)]
+        print(f"{H}x{W} grid, weights in [10, 20], {queries} random queries")
+
+        runs = {
+            "dijkstra (full tree)": lambda s, t: dijkstra(CG, s)[0][t],
+            "bidirectional": lambda s, t: shortest_path(CG, s, t, CRG)[0],
+            "A* manhattan": lambda s, t: astar(CG, s, t, manhattan(W, t, 10))[0],
+            "A* h = 0": lambda s, t: astar(CG, s, t, lambda v: 0)[0],
+        }
+        want = None
+        for name, f in runs.items():
+            Counting.reads = 0
+            t0 = time.perf_counter()
+            res = [f(s, t) for s, t in qs]
+            el = time.perf_counter() - t0
+            want = want or res
+            assert res == want
+            print(f"{name:22s} {el / queries * 1000:8.1f} ms/query, {Counting.reads // queries:8d} settled/query")
+
+    test()
+    # bench()
@@ -0,0 +1,244 @@
+from typing import List, Optional, Tuple
+import sys
+import warnings
+import numpy as np
+
+_I64 = np.iinfo(np.int64)
+
+
+def read_ints(buf: Optional[bytes] = None) -> np.ndarray:
+    """
+    All whitespace-separated integers of buf (default: the whole of sys.stdin.buffer) as int64.
+
+    np.fromstring parses in C, about 4x faster than bytes.split + int() on 10**7 tokens.
+    Malformed tokens raise ValueError; values must fit in int64.
+    """
+    if buf is None:
+        buf = sys.stdin.buffer.read()
+    buf = buf.strip()
+    if not buf:  # fromstring returns [0] for blank input
+        return np.zeros(0, dtype=np.int64)
+    with warnings.catch_warnings():
+        # a malformed token only stops fromstring with a DeprecationWarning
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            res = np.fromstring(buf, dtype=np.int64, sep=" ")
+        except DeprecationWarning:
+            raise ValueError("input contains a token that is not an integer") from None
+    if len(res) and (res.max() == _I64.max or res.min() == _I64.min):
+        # fromstring saturates on overflow; re-parse exactly (raises OverflowError if out of range)
+        res = np.array(buf.split(), dtype=np.int64)
+    return res
+
+
+class CSR:
+    """
+    Static graph in CSR form: the out-edges of v are the slots off[v]:off[v + 1] of to / w / eid.
+
+    Slots of a vertex keep the input order (as appending to adjacency lists would),
+    and an undirected edge {u, v} is stored as u->v and v->u with the same edge id.
+    Index arrays are int32 when they fit, so that 10**7 edges take a few hundred MB at most.
+    """
+
+    __slots__ = ("n", "m", "directed", "off", "to", "w", "eid")
+
+    def __init__(
+        self,
+        n: int,
+        u: np.ndarray,
+        v: np.ndarray,
+        w: Optional[np.ndarray] = None,
+        directed: bool = True,
+    ):
+        """
+        :param n: number of vertices.
+        :param u, v: endpoints of the m edges (0-based).
+        :param w: edge weights, or None for an unweighted graph.
+        :param directed: if False, every edge is stored in both directions.
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        u = np.asarray(u)
+        v = np.asarray(v)
+        m = len(u)
+        if len(v) != m or (w is not None and len(w) != m):
+            raise ValueError("u, v and w must have the same length")
+        if m and (min(u.min(), v.min()) < 0 or max(u.max(), v.max()) >= n):
+            raise IndexError("edge endpoint out of range")
+        idx = np.int32 if max(n, 2 * m) < 2**31 else np.int64
+        self.n = n
+        self.m = m
+        self.directed = directed
+
+        eid = np.arange(m, dtype=idx)
+        if directed:
+            src, dst = u, v
+        else:
+            # interleaved u->v, v->u per edge keeps the append order of adjacency lists
+            src = np.stack((u, v), axis=1).ravel()
+            dst = np.stack((v, u), axis=1).ravel()
+            eid = np.repeat(eid, 2)
+        k = len(src)
+        if n * k < 2**62:
+            # unique keys make the fast unstable sort stable (about 2x faster than kind="stable")
+            perm = np.argsort(src.astype(np.int64) * k + np.arange(k))
+        else:
+            perm = np.argsort(src, kind="stable")
+        self.off = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.off[1:])
+        self.to = dst.astype(idx, copy=False)[perm]
+        self.eid = eid[perm]
+        self.w = None if w is None else np.asarray(w)[self.eid]
+
+    def degree(self) -> np.ndarray:
+        return np.diff(self.off)
+
+    def neighbors(self, v: int) -> np.ndarray:
+        return self.to[self.off[v] : self.off[v + 1]]
+
+    # --- adapters to the list shapes of the other snippets ---
+    def to_adj(self) -> List[List[int]]:
+        """[[nv, ...] for v], e.g. for scc/tarjan.py."""
+        off, to = self.off.tolist(), self.to.tolist()
+        return [to[off[v] : off[v + 1]] for v in range(self.n)]
+
+    def to_weighted_adj(self) -> List[List[Tuple[int, int]]]:
+        """[[(nv, w), ...] for v], e.g. for dijkstra/simple.py."""
+        if self.w is None:
+            raise ValueError("graph is unweighted")
+        off, to, w = self.off.tolist(), self.to.tolist(), self.w.tolist()
+        return [list(zip(to[off[v] : off[v + 1]], w[off[v] : off[v + 1]])) for v in range(self.n)]
+
+    def to_edge_list(self) -> List[Tuple[int, int, int]]:
+        """
+        [(v, nv, w), ...] with w = eid if unweighted, e.g. for rerooting Graph_T.from_edges.
+
+        Directed: every slot. Undirected: every edge once, as (min(u, v), max(u, v), w) in input order,
+        so passing it on with directed=False does not double the edges again.
+        """
+        src = np.repeat(np.arange(self.n), np.diff(self.off))
+        slots = slice(None)
+        if not self.directed:
+            # slots are grouped by source, so the first slot of an edge is the one out of its smaller endpoint
+            _, slots = np.unique(self.eid, return_index=True)
+        third = self.eid if self.w is None else self.w
+        return list(zip(src[slots].tolist(), self.to[slots].tolist(), third[slots].tolist()))
+
+
+def parse_graph(
+    data: np.ndarray,
+    n: int,
+    m: int,
+    weighted: bool = False,
+    one_based: bool = True,
+    directed: bool = False,
+) -> CSR:
+    """
+    CSR from m edge lines "u v" (or "u v w") at the start of data, a flat int array as read_ints returns.
+    """
+    k = 3 if weighted else 2
+    if len(data) < k * m:
+        raise ValueError(f"expected {m} edges, got {len(data) // k}")
+    e = data[: k * m].reshape(m, k)
+    u, v = e[:, 0], e[:, 1]
+    if one_based:
+        u, v = u - 1, v - 1
+    return CSR(n, u, v, e[:, 2] if weighted else None, directed)
+
+
+def read_graph(
+    buf: Optional[bytes] = None,
+    weighted: bool = False,
+    one_based: bool = True,
+    directed: bool = False,
+    tree: bool = False,
+) -> Tuple[CSR, np.ndarray]:
+    """
+    Reads "N M" (or just "N" if tree, with M = N - 1) followed by the edges, from buf or stdin.
+    Returns the graph and the remaining integers (queries etc.).
+    """
+    data = read_ints(buf)
+    if tree:
+        n, m, p = int(data[0]), int(data[0]) - 1, 1
+    else:
+        n, m, p = int(data[0]), int(data[1]), 2
+    k = 3 if weighted else 2
+    g = parse_graph(data[p:], n, m, weighted, one_based, directed)
+    return g, data[p + k * m :]
+
+
+if __name__ == "__main__":
+
+    def test():
+        import random
+
+        assert read_ints(b"").tolist() == []
+        assert read_ints(b" \n ").tolist() == []
+        assert read_ints(b"1 -2\n3\t4\r\n").tolist() == [1, -2, 3, 4]
+        assert read_ints(b"9223372036854775807 -9223372036854775808").tolist() == [_I64.max, _I64.min]
+        for bad in (b"1 x 3", b"1 2.5", b"99999999999999999999"):
+            try:
+                read_ints(bad)
+                assert False
+            except (ValueError, OverflowError):
+                pass
+
+        for _ in range(200):
+            n = random.randint(1, 20)
+            m = random.randint(0, 40)
+            directed = random.random() < 0.5
+            edges = [(random.randrange(n), random.randrange(n), random.randint(-5, 5)) for _ in range(m)]
+            text = f"{n} {m}\n" + "".join(f"{a + 1} {b + 1} {c}\n" for a, b, c in edges) + "7 8\n"
+            g, rest = read_graph(text.encode(), weighted=True, directed=directed)
+            assert rest.tolist() == [7, 8]
+
+            adj = [[] for _ in range(n)]
+            for a, b, c in edges:
+                adj[a].append((b, c))
+                if not directed:
+                    adj[b].append((a, c))
+            assert g.to_weighted_adj() == adj
+            assert g.to_adj() == [[b for b, _ in row] for row in adj]
+            assert g.degree().tolist() == [len(row) for row in adj]
+            if directed:
+                assert g.to_edge_list() == [(a, b, c) for a, row in enumerate(adj) for b, c in row]
+            else:
+                assert g.to_edge_list() == [(min(a, b), max(a, b), c) for a, b, c in edges]
+
+        g, rest = read_graph(b"3\n1 2\n2 3\n", tree=True)
+        assert g.to_adj() == [[1], [0, 2], [1]] and len(rest) == 0
+        print("All tests passed!")
+
+    def bench(n=10**6, m=10**7):
+        import time
+
+        rng = np.random.default_rng(0)
+        uvw = np.stack((rng.integers(1, n + 1, m), rng.integers(1, n + 1, m), rng.integers(1, 10**9, m)), axis=1)
+        buf = f"{n} {m}\n".encode() + "\n".join(" ".join(map(str, r)) for r in uvw.tolist()).encode()
+        print(f"{len(buf) / 2**20:.0f} MiB, n = {n}, m = {m}")
+
+        t = time.perf_counter()
+        data = np.array(buf.split(), dtype=np.int64)
+        print(f"bytes.split + np.array  {time.perf_counter() - t:.2f}s")
+        t = time.perf_counter()
+        data = read_ints(buf)
+        print(f"read_ints               {time.perf_counter() - t:.2f}s")
+        t = time.perf_counter()
+        g = parse_graph(data[2:], n, m, weighted=True)
+        print(f"CSR (undirected)        {time.perf_counter() - t:.2f}s")
+        t = time.perf_counter()
+        adj = g.to_weighted_adj()
+        print(f"to_weighted_adj         {time.perf_counter() - t:.2f}s")
+        del adj
+
+        lines = buf.decode().split("\n")[1:]
+        t = time.perf_counter()
+        adj = [[] for _ in range(n)]
+        for line in lines:
+            a, b, c = map(int, line.split())
+            adj[a - 1].append((b - 1, c))
+            adj[b - 1].append((a - 1, c))
+        print(f"per-line map(int) loop  {time.perf_counter() - t:.2f}s")
+
+    test()
+    # bench()
@@ -0,0 +1,317 @@
+from typing import *
+
+T = TypeVar("T")
+M = TypeVar("M")
+
+
+class HLD:
+    """
+    Heavy-light decomposition of a tree, built without recursion.
+
+    Vertices are numbered in a heavy-child-first DFS order `pos`, so
+    - every heavy path is the contiguous range [pos[head[v]], pos[v]]
+    - every subtree is the contiguous range [pos[v], pos[v] + size[v])
+    and a path splits into O(log N) ranges.
+
+    Path / subtree queries run on any segment tree indexed by pos that supports
+    `seg[l:r]`, `seg[i] = x` and (for updates) `seg.apply_range(l, r, f)`,
+    e.g. segtree/simple.py SegmentTree and lazyseg/simple.py LazySegTree; use `reorder` to build it.
+    """
+
+    __slots__ = ("n", "root", "parent", "depth", "size", "heavy", "head", "pos", "order")
+
+    def __init__(self, n: int, edges: Iterable[Tuple[int, int]], root: int = 0):
+        """
+        :param n: number of vertices.
+        :param edges: the n - 1 edges (u, v).
+        """
+        if not 0 <= root < n:
+            raise IndexError(f"root must be in [0, {n}), got {root}")
+        self.n = n
+        self.root = root
+        adj: List[List[int]] = [[] for _ in range(n)]
+        m = 0
+        for u, v in edges:
+            adj[u].append(v)
+            adj[v].append(u)
+            m += 1
+        if m != n - 1:
+            raise ValueError("a tree on n vertices has n - 1 edges")
+
+        parent = [-1] * n
+        depth = [0] * n
+        bfs = [root]
+        visited = [False] * n
+        visited[root] = True
+        for v in bfs:
+            for nv in adj[v]:
+                if not visited[nv]:
+                    visited[nv] = True
+                    parent[nv] = v
+                    depth[nv] = depth[v] + 1
+                    bfs.append(nv)
+        if len(bfs) != n:
+            raise ValueError("edges do not form a tree")
+
+        size = [1] * n
+        heavy = [-1] * n
+        for v in reversed(bfs):
+            p = parent[v]
+            if p != -1:
+                size[p] += size[v]
+                if heavy[p] == -1 or size[v] > size[heavy[p]]:
+                    heavy[p] = v
+
+        head = [0] * n
+        pos = [0] * n
+        order = [0] * n  # order[pos[v]] = v
+        head[root] = root
+        stk = [root]
+        k = 0
+        while stk:
+            v = stk.pop()
+            pos[v] = k
+            order[k] = v
+            k += 1
+            for nv in adj[v]:
+                if nv != parent[v] and nv != heavy[v]:
+                    head[nv] = nv
+                    stk.append(nv)
+            h = heavy[v]
+            if h != -1:  # popped next, so the heavy path stays contiguous
+                head[h] = head[v]
+                stk.append(h)
+
+        self.parent = parent
+        self.depth = depth
+        self.size = size
+        self.heavy = heavy
+        self.head = head
+        self.pos = pos
+        self.order = order
+
+    def reorder(self, values: Sequence[T]) -> List[T]:
+        """values indexed by vertex -> list indexed by pos (the initial array of a segment tree)."""
+        return [values[v] for v in self.order]
+
+    def lca(self, u: int, v: int) -> int:
+        """O(log N)"""
+        head, parent, pos = self.head, self.parent, self.pos
+        while head[u] != head[v]:
+            if pos[head[u]] > pos[head[v]]:
+                u = parent[head[u]]
+            else:
+                v = parent[head[v]]
+        return u if pos[u] < pos[v] else v
+
+    def dist(self, u: int, v: int) -> int:
+        """Number of edges on the path u - v."""
+        return self.depth[u] + self.depth[v] - 2 * self.depth[self.lca(u, v)]
+
+    def _path_ranges(self, u: int, v: int, edge: bool) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """
+        Splits the path u - v into pos ranges [l, r).
+        Returns (up, down): up holds the ranges from u towards the lca (to be read right to left),
+        down the ranges from the lca towards v (left to right), both in path order.
+        With edge=True the lca itself is excluded (edge values live on their lower vertex).
+        """
+        head, parent, pos = self.head, self.parent, self.pos
+        up: List[Tuple[int, int]] = []
+        down: List[Tuple[int, int]] = []
+        while head[u] != head[v]:
+            if pos[head[u]] > pos[head[v]]:
+                up.append((pos[head[u]], pos[u] + 1))
+                u = parent[head[u]]
+            else:
+                down.append((pos[head[v]], pos[v] + 1))
+                v = parent[head[v]]
+        if pos[u] > pos[v]:
+            up.append((pos[v] + edge, pos[u] + 1))
+        else:
+            down.append((pos[u] + edge, pos[v] + 1))
+        down.reverse()
+        return up, down
+
+    def path_prod(
+        self,
+        u: int,
+        v: int,
+        seg,
+        op: Callable[[T, T], T],
+        e: T,
+        seg_rev=None,
+        edge: bool = False,
+    ) -> T:
+        """
+        op over the values on the path u -> v, in path order. O(log^2 N)
+
+        :param seg: segment tree over the values in pos order, with operation op and identity e.
+        :param seg_rev: for a non-commutative op, a segment tree over the same values with op reversed
+            (op_rev(a, b) = op(b, a)); it is used where the path runs towards the root.
+            If None, op is assumed to be commutative.
+        :param edge: values live on edges (stored at the lower vertex) instead of vertices.
+        """
+        if seg_rev is None:
+            seg_rev = seg
+        up, down = self._path_ranges(u, v, edge)
+        res = e
+        for l, r in up:
+            if l < r:
+                res = op(res, seg_rev[l:r])
+        for l, r in down:
+            if l < r:
+                res = op(res, seg[l:r])
+        return res
+
+    def path_apply(self, u: int, v: int, f: M, *segs, edge: bool = False) -> None:
+        """seg.apply_range over the path u - v, for each given segment tree. O(log^2 N)"""
+        up, down = self._path_ranges(u, v, edge)
+        for l, r in up + down:
+            if l < r:
+                for seg in segs:
+                    seg.apply_range(l, r, f)
+
+    def subtree_prod(self, v: int, seg, edge: bool = False) -> T:
+        """seg product over the subtree of v. O(log N)"""
+        l = self.pos[v] + edge
+        return seg[l : self.pos[v] + self.size[v]]
+
+    def subtree_apply(self, v: int, f: M, *segs, edge: bool = False) -> None:
+        """seg.apply_range over the subtree of v, for each given segment tree. O(log N)"""
+        l, r = self.pos[v] + edge, self.pos[v] + self.size[v]
+        if l < r:
+            for seg in segs:
+                seg.apply_range(l, r, f)
+
+    def set(self, v: int, x: T, *segs) -> None:
+        """Sets the value of vertex v (or of the edge to its parent) in each given segment tree."""
+        for seg in segs:
+            seg[self.pos[v]] = x
+
+
+if __name__ == "__main__":
+
+    class ListSeg:
+        """O(N) stand-in with the segment tree interface, for testing."""
+
+        def __init__(self, arr, op, e, action=None):
+            self.a, self.op, self.e, self.action = list(arr), op, e, action
+
+        def __getitem__(self, s):
+            res = self.e
+            for x in self.a[s]:
+                res = self.op(res, x)
+            return res
+
+        def __setitem__(self, i, x):
+            self.a[i] = x
+
+        def apply_range(self, l, r, f):
+            for i in range(l, r):
+                self.a[i] = self.action(f, self.a[i])
+
+    def load(rel: str, name: str):
+        """A sibling snippet by path (every snippet is called simple.py)."""
+        import importlib.util
+        import os
+
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", rel)
+        spec = importlib.util.spec_from_file_location(name, path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+
+    def test():
+        import random
+
+        SegmentTree = load("segtree/simple.py", "segtree_simple").SegmentTree
+        LazySegTree = load("lazyseg/simple.py", "lazyseg_simple").LazySegTree
+        MOD = 998244353
+
+        def matmul(x, y):  # 2x2 matrices, non-commutative
+            return (
+                (x[0] * y[0] + x[1] * y[2]) % MOD,
+                (x[0] * y[1] + x[1] * y[3]) % MOD,
+                (x[2] * y[0] + x[3] * y[2]) % MOD,
+                (x[2] * y[1] + x[3] * y[3]) % MOD,
+            )
+
+        I = (1, 0, 0, 1)
+        scale = lambda f, x: tuple(a * f % MOD for a in x)
+
+        # the trees hold (matrix, number of factors), so that scaling every factor by f,
+        # i.e. the product by f ** k, is an action LazySegTree can apply to a whole range
+        op = lambda a, b: (matmul(a[0], b[0]), a[1] + b[1])
+        op_rev = lambda a, b: op(b, a)
+        E = (I, 0)
+        act = lambda f, x: (scale(pow(f, x[1], MOD), x[0]), x[1])
+        mul = lambda f, g: f * g % MOD
+        make = {
+            "list": lambda arr, f: ListSeg(arr, f, E, act),
+            "segtree": lambda arr, f: SegmentTree(arr, f, E),
+            "lazyseg": lambda arr, f: LazySegTree(arr, f, E, mul, 1, act),
+        }
+
+        for it in range(300):
+            kind = ("list", "segtree", "lazyseg")[it % 3]
+            n = random.randint(1, 30)
+            edges = [(random.randrange(v), v) for v in range(1, n)]
+            root = random.randrange(n)
+            hld = HLD(n, edges, root)
+            vals = [tuple(random.randrange(10) for _ in range(4)) for _ in range(n)]
+            seg = make[kind](hld.reorder([(x, 1) for x in vals]), op)
+            seg_rev = make[kind](hld.reorder([(x, 1) for x in vals]), op_rev)
+
+            adj = [[] for _ in range(n)]
+            for a, b in edges:
+                adj[a].append(b)
+                adj[b].append(a)
+
+            def path(u, v):
+                prev = {u: None}
+                stk = [u]
+                while stk:
+                    x = stk.pop()
+                    for y in adj[x]:
+                        if y not in prev:
+                            prev[y] = x
+                            stk.append(y)
+                res = [v]
+                while res[-1] != u:
+                    res.append(prev[res[-1]])
+                return res[::-1]
+
+            for _ in range(30):
+                u, v = random.randrange(n), random.randrange(n)
+                p = path(u, v)
+                assert hld.dist(u, v) == len(p) - 1
+                assert hld.lca(u, v) == min(p, key=hld.depth.__getitem__)
+                t = random.randrange(3)
+                if t == 0:
+                    want = I
+                    for x in p:
+                        want = matmul(want, vals[x])
+                    assert hld.path_prod(u, v, seg, op, E, seg_rev)[0] == want
+                    # edge values live on the lower vertex
+                    want = I
+                    for a, b in zip(p, p[1:]):
+                        want = matmul(want, vals[b if hld.parent[b] == a else a])
+                    assert hld.path_prod(u, v, seg, op, E, seg_rev, edge=True)[0] == want
+                elif t == 1 and kind != "segtree":  # SegmentTree has no range apply
+                    f = random.randint(2, 5)
+                    hld.path_apply(u, v, f, seg, seg_rev)
+                    for x in p:
+                        vals[x] = scale(f, vals[x])
+                else:
+                    x = tuple(random.randrange(10) for _ in range(4))
+                    vals[u] = x
+                    hld.set(u, (x, 1), seg, seg_rev)
+                    # the subtree range is in pos order
+                    sub = sorted((w for w in range(n) if v in path(root, w)), key=hld.pos.__getitem__)
+                    want = I
+                    for w in sub:
+                        want = matmul(want, vals[w])
+                    assert hld.subtree_prod(v, seg)[0] == want
+        print("All tests passed!")
+
+    test()
@@ -0,0 +1,263 @@
+from typing import Iterable, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+Interval = Tuple[int, int]
+
+
+class CoverageMultiset:
+    """
+    Multiset of intervals [l, r) that keeps multiplicity (unlike IntervalSet, nothing is merged).
+    Answers how many times points are covered under independent add / remove.
+
+    - Offline mode (coords given): the tree is built over the compressed coordinates. O(log N) per operation.
+    - Online mode: a dynamic tree over [lo, hi) whose nodes are created on demand,
+      so coordinates up to 10**18 are fine. O(log(hi - lo)) per operation.
+
+    Each node keeps the min / max coverage of its range, the length attaining the min
+    and a pending add for its children. A node without children has uniform coverage.
+    """
+
+    def __init__(
+        self,
+        coords: Optional[Iterable[int]] = None,
+        lo: int = -(10**18),
+        hi: int = 10**18,
+    ):
+        """
+        :param coords: every endpoint that will be used (offline mode). None for online mode.
+        :param lo, hi: domain of the online mode; intervals must satisfy lo <= l < r <= hi.
+        """
+        if coords is not None:
+            self._xs: Optional[List[int]] = sorted(set(coords))
+            if len(self._xs) < 2:
+                raise ValueError("need at least two distinct coordinates")
+            self._lo, self._hi = 0, len(self._xs) - 1  # index space of the segments
+        else:
+            if lo >= hi:
+                raise ValueError(f"empty domain [{lo}, {hi})")
+            self._xs = None
+            self._lo, self._hi = lo, hi
+
+        # node 0 is unused, node 1 is the root
+        self._left: List[int] = [0, 0]
+        self._right: List[int] = [0, 0]
+        self._mn: List[int] = [0, 0]
+        self._mncnt: List[int] = [0, self._width(self._lo, self._hi)]
+        self._mx: List[int] = [0, 0]
+        self._lz: List[int] = [0, 0]
+
+        self._intervals: Counter = Counter()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({sorted(self._intervals.elements())})"
+
+    def __len__(self) -> int:
+        """Returns the number of intervals (with multiplicity)."""
+        return self._intervals.total()
+
+    def _width(self, a: int, b: int) -> int:
+        return b - a if self._xs is None else self._xs[b] - self._xs[a]
+
+    def _coord(self, i: int) -> int:
+        return i if self._xs is None else self._xs[i]
+
+    def _index(self, l: int, r: int) -> Tuple[int, int]:
+        if self._xs is None:
+            if not self._lo <= l < r <= self._hi:
+                raise ValueError(f"interval [{l}, {r}) is empty or out of [{self._lo}, {self._hi})")
+            return l, r
+        a, b = bisect_left(self._xs, l), bisect_left(self._xs, r)
+        if not (a < b <= self._hi and self._xs[a] == l and self._xs[b] == r):
+            raise ValueError(f"interval [{l}, {r}) is empty or not on the given coordinates")
+        return a, b
+
+    def _new_node(self, val: int, cnt: int) -> int:
+        self._left.append(0)
+        self._right.append(0)
+        self._mn.append(val)
+        self._mncnt.append(cnt)
+        self._mx.append(val)
+        self._lz.append(0)
+        return len(self._mn) - 1
+
+    def _push(self, v: int, nl: int, nr: int) -> None:
+        mid = (nl + nr) >> 1
+        if self._left[v] == 0:
+            # uniform node: children start with its coverage
+            val = self._mn[v]
+            self._left[v] = self._new_node(val, self._width(nl, mid))
+            self._right[v] = self._new_node(val, self._width(mid, nr))
+            self._lz[v] = 0
+        elif self._lz[v]:
+            d = self._lz[v]
+            for c in (self._left[v], self._right[v]):
+                self._mn[c] += d
+                self._mx[c] += d
+                self._lz[c] += d
+            self._lz[v] = 0
+
+    def _pull(self, v: int) -> None:
+        L, R = self._left[v], self._right[v]
+        mn, mncnt = self._mn, self._mncnt
+        if mn[L] < mn[R]:
+            mn[v], mncnt[v] = mn[L], mncnt[L]
+        elif mn[L] > mn[R]:
+            mn[v], mncnt[v] = mn[R], mncnt[R]
+        else:
+            mn[v], mncnt[v] = mn[L], mncnt[L] + mncnt[R]
+        self._mx[v] = max(self._mx[L], self._mx[R])
+
+    def _range_add(self, a: int, b: int, d: int) -> None:
+        # partially covered nodes are pulled in reverse visiting order, i.e. children before parents
+        partial = []
+        stk = [(1, self._lo, self._hi)]
+        while stk:
+            v, nl, nr = stk.pop()
+            if a <= nl and nr <= b:
+                self._mn[v] += d
+                self._mx[v] += d
+                self._lz[v] += d
+                continue
+            self._push(v, nl, nr)
+            partial.append(v)
+            mid = (nl + nr) >> 1
+            if a < mid:
+                stk.append((self._left[v], nl, mid))
+            if mid < b:
+                stk.append((self._right[v], mid, nr))
+        for v in reversed(partial):
+            self._pull(v)
+
+    def add(self, l: int, r: int) -> None:
+        """Adds one copy of [l, r)."""
+        a, b = self._index(l, r)
+        self._intervals[(l, r)] += 1
+        self._range_add(a, b, 1)
+
+    def remove(self, l: int, r: int) -> None:
+        """Removes one copy of [l, r). Raises KeyError if it is not in the multiset."""
+        if self._intervals[(l, r)] == 0:
+            raise KeyError((l, r))
+        a, b = self._index(l, r)
+        self._intervals[(l, r)] -= 1
+        if self._intervals[(l, r)] == 0:
+            del self._intervals[(l, r)]
+        self._range_add(a, b, -1)
+
+    def coverage(self, x: int) -> int:
+        """Number of intervals containing x."""
+        if self._xs is None:
+            i = x
+        else:
+            i = bisect_right(self._xs, x) - 1
+        if not self._lo <= i < self._hi:
+            return 0
+
+        v, nl, nr = 1, self._lo, self._hi
+        acc = 0
+        while self._left[v]:
+            acc += self._lz[v]
+            mid = (nl + nr) >> 1
+            if i < mid:
+                v, nr = self._left[v], mid
+            else:
+                v, nl = self._right[v], mid
+        return acc + self._mn[v]
+
+    def covered_length(self) -> int:
+        """Length covered at least once. O(1)"""
+        total = self._width(self._lo, self._hi)
+        return total - self._mncnt[1] if self._mn[1] == 0 else total
+
+    def covered_length_at_least(self, k: int) -> int:
+        """
+        Length covered at least k times.
+        O(1) for k <= 1. Otherwise it visits the nodes with min < k <= max, whose range straddles
+        the threshold: O((1 + C) log N) where C is the number of times the coverage crosses k,
+        so O(N) at worst (e.g. coverage alternating between k - 1 and k).
+        """
+        if k <= 0:
+            return self._width(self._lo, self._hi)
+        if k == 1:
+            return self.covered_length()
+
+        res = 0
+        stk = [(1, self._lo, self._hi, 0)]
+        while stk:
+            v, nl, nr, acc = stk.pop()
+            if self._mn[v] + acc >= k:
+                res += self._width(nl, nr)
+                continue
+            if self._mx[v] + acc < k:
+                continue
+            # mn < k <= mx, so v is not uniform and has children
+            acc += self._lz[v]
+            mid = (nl + nr) >> 1
+            stk.append((self._left[v], nl, mid, acc))
+            stk.append((self._right[v], mid, nr, acc))
+        return res
+
+    def max_coverage(self) -> Tuple[int, int]:
+        """Returns (max coverage, leftmost point attaining it). O(depth)"""
+        t = self._mx[1]
+        v, nl, nr = 1, self._lo, self._hi
+        acc = 0
+        while self._left[v]:
+            acc += self._lz[v]
+            mid = (nl + nr) >> 1
+            if self._mx[self._left[v]] + acc == t:
+                v, nr = self._left[v], mid
+            else:
+                v, nl = self._right[v], mid
+        return t, self._coord(nl)
+
+
+if __name__ == "__main__":
+
+    def test():
+        import random
+
+        for offline in (True, False):
+            coords = list(range(0, 41, 2))
+            cm = CoverageMultiset(coords) if offline else CoverageMultiset(lo=-5, hi=45)
+            cov = Counter()
+            for _ in range(2000):
+                if random.random() < 0.6 or not len(cm):
+                    l, r = sorted(random.sample(coords, 2))
+                    cm.add(l, r)
+                    for x in range(l, r):
+                        cov[x] += 1
+                else:
+                    l, r = random.choice(list(cm._intervals))
+                    cm.remove(l, r)
+                    for x in range(l, r):
+                        cov[x] -= 1
+
+                x = random.randrange(-5, 45)
+                assert cm.coverage(x) == cov[x]
+                assert cm.covered_length() == sum(c >= 1 for c in cov.values())
+                k = random.randint(1, 5)
+                assert cm.covered_length_at_least(k) == sum(c >= k for c in cov.values())
+                mx = max(cov.values(), default=0)
+                t, x = cm.max_coverage()
+                assert t == mx
+                if mx > 0:
+                    assert x == min(y for y, c in cov.items() if c == mx)
+        try:
+            cm.remove(100, 200)
+            assert False
+        except KeyError:
+            pass
+        print("All tests passed!")
+
+    test()
+
+    # huge coordinates (online mode)
+    cm = CoverageMultiset(lo=0, hi=10**18 + 1)
+    cm.add(1, 10**18)
+    cm.add(10**17, 10**18 + 1)
+    cm.add(10**17, 2 * 10**17)
+    print(cm.max_coverage())  # (3, 100000000000000000)
+    print(cm.covered_length_at_least(2))  # 900000000000000000
+    print(cm.covered_length())  # 1000000000000000000
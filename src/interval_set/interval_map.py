@@ -0,0 +1,175 @@
+from typing import Callable, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
+from itertools import islice
+from sortedcontainers import SortedList
+
+V = TypeVar("V")
+A = TypeVar("A")
+Run = Tuple[int, int, V]
+
+_SENTINEL = object()
+
+
+def _same(a, b) -> bool:
+    """a == b as a plain bool; values with an elementwise == (numpy arrays) only count as equal if identical."""
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except ValueError:
+        return False
+
+
+class IntervalMap(Generic[V]):
+    """
+    Maps disjoint runs [l, r) to values (Chtholly tree / ODT) using a SortedList of (l, r, value).
+    Adjacent runs with equal values are merged, and uncovered points have no value.
+    assign is amortised O(log N): each call adds O(1) runs and every removed run was added once.
+    """
+
+    def __init__(self, runs: Optional[Iterable[Run]] = None):
+        self._INF = 2 * 10**18
+        # Sentinels to avoid boundary checks
+        self._sl = SortedList(
+            [(-self._INF, -self._INF, _SENTINEL), (self._INF, self._INF, _SENTINEL)]
+        )
+
+        if runs:
+            for l, r, v in runs:
+                self.assign(l, r, v)
+
+    def __repr__(self):
+        return f"IntervalMap({list(self)})"
+
+    def __len__(self):
+        """Returns the number of runs."""
+        return len(self._sl) - 2
+
+    def __iter__(self) -> Iterator[Run]:
+        """Iterates over the runs (l, r, value) in ascending order."""
+        return islice(self._sl, 1, len(self._sl) - 1)
+
+    def __contains__(self, x: int) -> bool:
+        l, r, _ = self._sl[self._sl.bisect_left((x, self._INF)) - 1]
+        return l <= x < r
+
+    def __getitem__(self, x: int) -> V:
+        l, r, v = self._sl[self._sl.bisect_left((x, self._INF)) - 1]
+        if not l <= x < r:
+            raise KeyError(x)
+        return v
+
+    def get(self, x: int, default: Optional[V] = None) -> Optional[V]:
+        """Returns the value at x, or default if x is not covered. O(log N)"""
+        l, r, v = self._sl[self._sl.bisect_left((x, self._INF)) - 1]
+        return v if l <= x < r else default
+
+    def _split(self, x: int) -> int:
+        """
+        Makes x a run boundary and returns the index (in the internal list)
+        of the first run starting at or after x. O(log N)
+        """
+        idx = self._sl.bisect_left((x, self._INF)) - 1
+        l, r, v = self._sl[idx]
+        if l == x:
+            return idx
+        if x < r:
+            self._sl.pop(idx)
+            self._sl.add((l, x, v))
+            self._sl.add((x, r, v))
+        return idx + 1
+
+    def assign(self, l: int, r: int, value: V) -> None:
+        """Sets every point of [l, r) to value. Amortised O(log N)"""
+        if l >= r:
+            return
+        i = self._split(l)
+        j = self._split(r)
+        del self._sl[i:j]
+
+        # Merge with equal neighbours
+        pl, pr, pv = self._sl[i - 1]
+        if pr == l and _same(pv, value):
+            l = pl
+            self._sl.pop(i - 1)
+            i -= 1
+        nl, nr, nv = self._sl[i]
+        if nl == r and _same(nv, value):
+            r = nr
+            self._sl.pop(i)
+        self._sl.add((l, r, value))
+
+    def erase(self, l: int, r: int) -> None:
+        """Removes every value on [l, r). Amortised O(log N)"""
+        if l >= r:
+            return
+        i = self._split(l)
+        j = self._split(r)
+        del self._sl[i:j]
+
+    def runs(self, l: int, r: int) -> Iterator[Run]:
+        """Iterates over the runs clipped to [l, r), without splitting. O(log N + K)"""
+        if l >= r:
+            return
+        idx = self._sl.bisect_left((l, self._INF)) - 1
+        if self._sl[idx][1] <= l:
+            idx += 1
+        for rl, rr, v in islice(self._sl, idx, len(self._sl) - 1):
+            if rl >= r:
+                break
+            yield (rl if rl > l else l, rr if rr < r else r, v)
+
+    def fold(self, l: int, r: int, f: Callable[[A, int, int, V], A], init: A) -> A:
+        """
+        Aggregates the runs clipped to [l, r) as f(...f(f(init, l0, r0, v0), l1, r1, v1)...).
+        O(log N + K)
+        """
+        acc = init
+        for rl, rr, v in self.runs(l, r):
+            acc = f(acc, rl, rr, v)
+        return acc
+
+
+if __name__ == "__main__":
+
+    def test():
+        import random
+
+        N = 60
+        im = IntervalMap()
+        ref = [None] * N
+        for _ in range(3000):
+            l, r = sorted(random.sample(range(N + 1), 2))
+            t = random.randrange(4)
+            if t <= 1:
+                v = random.randrange(3)
+                im.assign(l, r, v)
+                ref[l:r] = [v] * (r - l)
+            elif t == 2:
+                im.erase(l, r)
+                ref[l:r] = [None] * (r - l)
+            else:
+                want = sum(ref[x] for x in range(l, r) if ref[x] is not None)
+                got = im.fold(l, r, lambda acc, a, b, v: acc + v * (b - a), 0)
+                assert got == want
+
+            assert [im.get(x) for x in range(N)] == ref
+            runs = list(im)
+            for (_, r0, v0), (l1, _, v1) in zip(runs, runs[1:]):
+                assert r0 < l1 or v0 != v1  # equal neighbours are merged
+
+        # array values: no truth-value error, only the same object merges
+        import numpy as np
+
+        a = np.array([1, 2])
+        im = IntervalMap([(0, 2, a), (2, 4, a), (4, 6, np.array([1, 2]))])
+        assert [(l, r) for l, r, _ in im] == [(0, 4), (4, 6)]
+        print("All tests passed!")
+
+    test()
+
+    # scheduler-like usage
+    im = IntervalMap([(0, 10, "idle")])
+    im.assign(3, 5, "busy")
+    im.assign(5, 8, "busy")
+    print(im)  # [(0, 3, 'idle'), (3, 8, 'busy'), (8, 10, 'idle')]
+    print(list(im.runs(4, 9)))  # [(4, 8, 'busy'), (8, 9, 'idle')]
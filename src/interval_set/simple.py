@@ -1,8 +1,12 @@
-from typing import Optional, List, Tuple, Iterable
+from typing import TYPE_CHECKING, Optional, List, Tuple, Iterable, Iterator
+from itertools import chain, islice
 from sortedcontainers import SortedList
 
 Interval = Tuple[int, int]
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class IntervalSet:
     """
@@ -24,23 +28,30 @@ class IntervalSet:
                 self.add(l, r)
 
     @classmethod
-    def _from_sorted_disjoint(cls, intervals: List[Interval]) -> "IntervalSet":
+    def _from_sorted_disjoint(
+        cls, intervals: List[Interval], sz: Optional[int] = None
+    ) -> "IntervalSet":
         """
         Fast constructor for internal use when intervals are already sorted and disjoint.
         Complexity: O(N)
         """
         instance = cls()
-        # Clear default sentinels to rebuild efficiently
-        instance._sl.clear()
-        instance._sl.update(intervals)
-        # Re-add sentinels
-        instance._sl.add((-instance._INF, -instance._INF))
-        instance._sl.add((instance._INF, instance._INF))
-
-        # Calculate size in O(N)
-        instance._sz = sum(r - l for l, r in intervals)
+        instance._assign_sorted_disjoint(intervals, sz)
         return instance
 
+    def _assign_sorted_disjoint(
+        self, intervals: List[Interval], sz: Optional[int] = None
+    ) -> None:
+        """Replace the contents in one bulk load (sentinels included). O(N)"""
+        self._sl = SortedList(
+            [(-self._INF, -self._INF), *intervals, (self._INF, self._INF)]
+        )
+        self._sz = sum(r - l for l, r in intervals) if sz is None else sz
+
+    def _splice_is_cheaper(self, m: int) -> bool:
+        """Whether m point updates at O(log N) beat one O(N + m) rebuild."""
+        return m * (len(self) + 1).bit_length() < len(self)
+
     def __repr__(self):
         return f"IntervalSet({list(self)})"
 
@@ -48,10 +59,9 @@ class IntervalSet:
         """Returns the number of disjoint intervals."""
         return len(self._sl) - 2
 
-    def __iter__(self):
-        """Iterates over the intervals in ascending order."""
-        for i in range(1, len(self._sl) - 1):
-            yield self._sl[i]
+    def __iter__(self) -> Iterator[Interval]:
+        """Iterates over the intervals in ascending order. O(N) in total"""
+        return islice(self._sl, 1, len(self._sl) - 1)
 
     def __contains__(self, x: int) -> bool:
         """Checks if x is contained in any interval. O(log N)"""
@@ -175,45 +185,86 @@ class IntervalSet:
                 self._sz += next_r - qr
                 break
 
-    def union(self, other: "IntervalSet") -> "IntervalSet":
-        """Returns the union of two IntervalSets. O(N + M)"""
+    @staticmethod
+    def _coalesce(intervals: Iterable[Interval]) -> List[Interval]:
+        """Sort a batch and merge overlapping or touching intervals. O(K log K)"""
+        batch = sorted((l, r) for l, r in intervals if l < r)
         merged = []
-        it0 = iter(self)
-        it1 = iter(other)
-        cur0 = next(it0, None)
-        cur1 = next(it1, None)
+        for l, r in batch:
+            if merged and l <= merged[-1][1]:
+                if r > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], r)
+            else:
+                merged.append((l, r))
+        return merged
 
-        curr_l, curr_r = None, None
+    def add_many(self, intervals: Iterable[Interval]) -> None:
+        """
+        Adds every [l, r) of the batch.
+        The batch is coalesced by a sweep, then merged into the set in one linear pass
+        and one rebuild: O(K log K + N). Small batches are spliced in at O(K log N).
+        """
+        batch = self._coalesce(intervals)
+        if self._splice_is_cheaper(len(batch)):
+            for l, r in batch:
+                self.add(l, r)
+        else:
+            self._assign_sorted_disjoint(*self._merge_union(iter(self), iter(batch)))
 
-        def push(l, r):
-            nonlocal curr_l, curr_r
-            if curr_l is None:
-                curr_l, curr_r = l, r
-            else:
-                if l <= curr_r:
-                    curr_r = max(curr_r, r)
-                else:
-                    merged.append((curr_l, curr_r))
-                    curr_l, curr_r = l, r
+    def discard_many(self, intervals: Iterable[Interval]) -> None:
+        """
+        Removes every [l, r) of the batch. O(K log K + N), or O(K log N) for small batches.
+        """
+        batch = self._coalesce(intervals)
+        if self._splice_is_cheaper(len(batch)):
+            for l, r in batch:
+                self.discard(l, r)
+        else:
+            self._assign_sorted_disjoint(
+                *self._merge_difference(iter(self), iter(batch))
+            )
+
+    @staticmethod
+    def _merge_union(
+        it0: Iterator[Interval], it1: Iterator[Interval]
+    ) -> Tuple[List[Interval], int]:
+        """Union of two sorted disjoint streams, with its total length. O(N + M)"""
+        merged = []
+        sz = 0
+        cur0 = next(it0, None)
+        cur1 = next(it1, None)
+        curr_l = curr_r = None
 
         while cur0 is not None or cur1 is not None:
             if cur1 is None or (cur0 is not None and cur0 < cur1):
-                push(*cur0)
+                l, r = cur0
                 cur0 = next(it0, None)
             else:
-                push(*cur1)
+                l, r = cur1
                 cur1 = next(it1, None)
 
+            if curr_l is None:
+                curr_l, curr_r = l, r
+            elif l <= curr_r:
+                if r > curr_r:
+                    curr_r = r
+            else:
+                merged.append((curr_l, curr_r))
+                sz += curr_r - curr_l
+                curr_l, curr_r = l, r
+
         if curr_l is not None:
             merged.append((curr_l, curr_r))
-
-        return self._from_sorted_disjoint(merged)
-
-    def intersection(self, other: "IntervalSet") -> "IntervalSet":
-        """Returns the intersection of two IntervalSets. O(N + M)"""
+            sz += curr_r - curr_l
+        return merged, sz
+
+    @staticmethod
+    def _merge_intersection(
+        it0: Iterator[Interval], it1: Iterator[Interval]
+    ) -> Tuple[List[Interval], int]:
+        """Intersection of two sorted disjoint streams, with its total length. O(N + M)"""
         result = []
-        it0 = iter(self)
-        it1 = iter(other)
+        sz = 0
         cur0 = next(it0, None)
         cur1 = next(it1, None)
 
@@ -222,26 +273,29 @@ class IntervalSet:
             l1, r1 = cur1
 
             # Intersection exists
-            start = max(l0, l1)
-            end = min(r0, r1)
-
+            start = l0 if l0 > l1 else l1
+            end = r0 if r0 < r1 else r1
             if start < end:
                 result.append((start, end))
+                sz += end - start
 
             if r0 < r1:
                 cur0 = next(it0, None)
             else:
                 cur1 = next(it1, None)
 
-        return self._from_sorted_disjoint(result)
+        return result, sz
 
-    def difference(self, other: "IntervalSet") -> "IntervalSet":
-        """Returns the difference (self - other). O(N + M)"""
+    @staticmethod
+    def _merge_difference(
+        it0: Iterator[Interval], it1: Iterator[Interval]
+    ) -> Tuple[List[Interval], int]:
+        """it0 minus it1 for sorted disjoint streams, with its total length. O(N + M)"""
         result = []
-        it1 = iter(other)
+        sz = 0
         cur1 = next(it1, None)
 
-        for l, r in self:
+        for l, r in it0:
             # Skip other intervals that end before current starts
             while cur1 and cur1[1] <= l:
                 cur1 = next(it1, None)
@@ -252,7 +306,9 @@ class IntervalSet:
                 l1, r1 = cur1
                 if curr_l < l1:
                     result.append((curr_l, l1))
-                curr_l = max(curr_l, r1)
+                    sz += l1 - curr_l
+                if r1 > curr_l:
+                    curr_l = r1
 
                 if r <= r1:
                     break
@@ -260,8 +316,75 @@ class IntervalSet:
 
             if curr_l < r:
                 result.append((curr_l, r))
+                sz += r - curr_l
+
+        return result, sz
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        """Returns the union of two IntervalSets. O(N + M)"""
+        return self._from_sorted_disjoint(*self._merge_union(iter(self), iter(other)))
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        """Returns the intersection of two IntervalSets. O(N + M)"""
+        return self._from_sorted_disjoint(
+            *self._merge_intersection(iter(self), iter(other))
+        )
+
+    def difference(self, other: "IntervalSet") -> "IntervalSet":
+        """Returns the difference (self - other). O(N + M)"""
+        return self._from_sorted_disjoint(
+            *self._merge_difference(iter(self), iter(other))
+        )
 
-        return self._from_sorted_disjoint(result)
+    def update(self, other: "IntervalSet") -> None:
+        """
+        self |= other.
+        O(M log N) by splicing each interval of a small other, O(N + M) otherwise.
+        """
+        if self._splice_is_cheaper(len(other)):
+            for l, r in list(other):
+                self.add(l, r)
+        else:
+            self._assign_sorted_disjoint(*self._merge_union(iter(self), iter(other)))
+
+    def intersection_update(self, other: "IntervalSet") -> None:
+        """
+        self &= other.
+        O(M log N + K) with K the size of the result when other is small, O(N + M) otherwise.
+        """
+        if not self._splice_is_cheaper(len(other)):
+            self._assign_sorted_disjoint(
+                *self._merge_intersection(iter(self), iter(other))
+            )
+            return
+
+        result = []
+        sz = 0
+        sl = self._sl
+        for l1, r1 in list(other):
+            idx = sl.bisect_left((l1, self._INF)) - 1
+            for l0, r0 in sl.islice(idx, len(sl) - 1):
+                if l0 >= r1:
+                    break
+                start = l0 if l0 > l1 else l1
+                end = r0 if r0 < r1 else r1
+                if start < end:
+                    result.append((start, end))
+                    sz += end - start
+        self._assign_sorted_disjoint(result, sz)
+
+    def difference_update(self, other: "IntervalSet") -> None:
+        """
+        self -= other.
+        O(M log N) by splicing each interval of a small other, O(N + M) otherwise.
+        """
+        if self._splice_is_cheaper(len(other)):
+            for l, r in list(other):
+                self.discard(l, r)
+        else:
+            self._assign_sorted_disjoint(
+                *self._merge_difference(iter(self), iter(other))
+            )
 
     def symmetric_difference(self, other: "IntervalSet") -> "IntervalSet":
         """Returns the symmetric difference (XOR). O(N + M)"""
@@ -299,6 +422,16 @@ class IntervalSet:
                 return False
         return True
 
+    def freeze(self) -> "FrozenIntervalSet":
+        """Returns an immutable array-backed snapshot for vectorized queries. O(N)"""
+        import numpy as np  # only the snapshot needs numpy
+
+        n = len(self._sl) - 1  # left sentinel included, right sentinel dropped
+        arr = np.fromiter(
+            chain.from_iterable(islice(self._sl, 0, n)), dtype=np.int64, count=2 * n
+        ).reshape(n, 2)
+        return FrozenIntervalSet(arr[:, 0].copy(), arr[:, 1].copy(), self._sz)
+
     # Operator overloads
     def __or__(self, other):
         return self.union(other)
@@ -312,6 +445,18 @@ class IntervalSet:
     def __xor__(self, other):
         return self.symmetric_difference(other)
 
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
     def __le__(self, other):
         return self.issubset(other)
 
@@ -322,6 +467,78 @@ class IntervalSet:
         return self._sl == other._sl
 
 
+class FrozenIntervalSet:
+    """
+    Immutable snapshot of an IntervalSet: two sorted int64 arrays (starts, ends).
+    Batch queries are answered with one numpy.searchsorted call instead of
+    one SortedList bisect per point.
+    """
+
+    __slots__ = ("_s", "_e", "_sz")
+
+    def __init__(self, starts: "np.ndarray", ends: "np.ndarray", sz: int):
+        """starts / ends begin with the (-INF, -INF) sentinel of IntervalSet."""
+        self._s = starts
+        self._e = ends
+        self._sz = sz
+
+    @property
+    def starts(self) -> "np.ndarray":
+        return self._s[1:]
+
+    @property
+    def ends(self) -> "np.ndarray":
+        return self._e[1:]
+
+    def __repr__(self):
+        return f"FrozenIntervalSet({list(self)})"
+
+    def __len__(self):
+        """Returns the number of disjoint intervals."""
+        return len(self._s) - 1
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self.starts.tolist(), self.ends.tolist())
+
+    def __contains__(self, x: int) -> bool:
+        """O(log N)"""
+        idx = int(self._s.searchsorted(x, side="right")) - 1
+        return x < self._e[idx]
+
+    def total_len(self) -> int:
+        """Returns the sum of lengths of all intervals. O(1)"""
+        return self._sz
+
+    def _locate(self, xs) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        import numpy as np
+
+        xs = np.asarray(xs, dtype=np.int64)
+        idx = self._s.searchsorted(xs, side="right") - 1  # >= 0 thanks to the sentinel
+        return xs, idx, xs < self._e[idx]
+
+    def contains_many(self, xs) -> "np.ndarray":
+        """Boolean array: xs[i] in self. O(Q log N) in one numpy call"""
+        return self._locate(xs)[2]
+
+    def mex_many(self, xs) -> "np.ndarray":
+        """Array of IntervalSet.mex(x) for each x: r if x is in [l, r), else x."""
+        xs, idx, inside = self._locate(xs)
+        res = xs.copy()
+        res[inside] = self._e[idx[inside]]
+        return res
+
+    def canonical_many(self, xs) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Arrays (l, r) of the interval containing each x.
+        Uncovered x gets the empty interval (x, x).
+        """
+        xs, idx, inside = self._locate(xs)
+        l, r = xs.copy(), xs.copy()
+        l[inside] = self._s[idx[inside]]
+        r[inside] = self._e[idx[inside]]
+        return l, r
+
+
 if __name__ == "__main__":
 
     iset = IntervalSet()
@@ -356,3 +573,56 @@ if __name__ == "__main__":
 
     print("disjoint check", s0.isdisjoint(s1))  # False
     print("disjoint check", (s0 - s1).isdisjoint(s1 - s0))  # True
+
+    def test():
+        import random
+
+        def brute(s):
+            return {x for l, r in s for x in range(l, r)}
+
+        def rand_set(k):
+            return IntervalSet(
+                (l, l + random.randint(1, 6))
+                for l in random.sample(range(100), k)
+            )
+
+        for _ in range(300):
+            a, b = rand_set(random.randint(0, 30)), rand_set(random.randint(0, 3))
+            for op, iop, f in (
+                (IntervalSet.__or__, IntervalSet.__ior__, set.__or__),
+                (IntervalSet.__and__, IntervalSet.__iand__, set.__and__),
+                (IntervalSet.__sub__, IntervalSet.__isub__, set.__sub__),
+            ):
+                for x, y in ((a, b), (b, a)):
+                    want = f(brute(x), brute(y))
+                    res = op(x, y)
+                    assert brute(res) == want and res.total_len() == len(want)
+                    inplace = IntervalSet(x)
+                    assert iop(inplace, y) is inplace
+                    assert inplace == res and inplace.total_len() == len(want)
+            batch = [
+                (l, l + random.randint(-1, 6)) for l in random.choices(range(100), k=40)
+            ]
+            bs = {x for l, r in batch for x in range(l, r)}
+            c = IntervalSet(a)
+            c.add_many(batch)
+            assert brute(c) == brute(a) | bs and c.total_len() == len(brute(c))
+            assert c == a | IntervalSet(batch)
+            c.discard_many(batch[:20])
+            want = (brute(a) | bs) - {x for l, r in batch[:20] for x in range(l, r)}
+            assert brute(c) == want and c.total_len() == len(want)
+            fz = c.freeze()
+            xs = list(range(-2, 110))
+            assert fz.contains_many(xs).tolist() == [x in c for x in xs]
+            assert fz.mex_many(xs).tolist() == [c.mex(x) for x in xs]
+            ls, rs = fz.canonical_many(xs)
+            assert [(l, r) if l < r else None for l, r in zip(ls.tolist(), rs.tolist())] == [
+                c.canonical(x) for x in xs
+            ]
+            assert list(fz) == list(c) and fz.total_len() == c.total_len()
+            assert all((x in fz) == (x in c) for x in xs)
+            assert (a <= b) == (brute(a) <= brute(b))
+            assert a.isdisjoint(b) == brute(a).isdisjoint(brute(b))
+        print("All tests passed!")
+
+    test()
@@ -0,0 +1,286 @@
+from typing import Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+from bisect import bisect_left, bisect_right
+
+P = TypeVar("P")
+Interval = Tuple[int, int]
+
+
+class IntervalTree(Generic[P]):
+    """
+    Static centered interval tree over individual (non-merged) intervals [l, r) with payloads.
+
+    Each node owns the intervals containing its center, listed by start ascending and by end descending.
+    - Construction: O(N log N)
+    - stab / overlap: O(log N + K), K = number of reported intervals
+    - count_stab / count_overlap: O(log N), from the globally sorted starts and ends
+    - *_many: one sweep over the sorted queries, O((N + Q) log Q + sum K)
+    """
+
+    def __init__(
+        self, intervals: Iterable[Interval], payloads: Optional[Sequence[P]] = None
+    ):
+        """
+        :param intervals: (l, r) pairs with l < r.
+        :param payloads: payloads[i] is reported for the i-th interval (defaults to i).
+        """
+        self._l: List[int] = []
+        self._r: List[int] = []
+        for l, r in intervals:
+            if not l < r:
+                raise ValueError(f"empty interval [{l}, {r})")
+            self._l.append(l)
+            self._r.append(r)
+        n = len(self._l)
+        self._payload = list(payloads) if payloads is not None else list(range(n))
+        if len(self._payload) != n:
+            raise ValueError("payloads and intervals differ in length")
+
+        by_start = sorted(range(n), key=self._l.__getitem__)
+        self._by_start = by_start
+        self._sorted_l = [self._l[i] for i in by_start]
+        self._by_end = sorted(range(n), key=self._r.__getitem__)
+        self._sorted_r = [self._r[i] for i in self._by_end]
+
+        # node arrays
+        self._center: List[int] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._node_l: List[List[int]] = []  # ids by start ascending
+        self._node_lv: List[List[int]] = []  # their starts
+        self._node_r: List[List[int]] = []  # ids by end descending
+        self._node_rv: List[List[int]] = []  # their ends, negated (ascending)
+
+        self._root = self._build(by_start)
+
+    def _build(self, ids: List[int]) -> int:
+        """Iterative build; ids stay sorted by start through stable partitions."""
+        if not ids:
+            return -1
+        L, R = self._l, self._r
+        root = self._new_node()
+        stk = [(root, ids)]
+        while stk:
+            v, ids = stk.pop()
+            c = L[ids[len(ids) >> 1]]
+            lo, here, hi = [], [], []
+            for i in ids:
+                if R[i] <= c:
+                    lo.append(i)
+                elif L[i] > c:
+                    hi.append(i)
+                else:
+                    here.append(i)
+
+            self._center[v] = c
+            self._node_l[v] = here
+            self._node_lv[v] = [L[i] for i in here]
+            by_end = sorted(here, key=R.__getitem__, reverse=True)
+            self._node_r[v] = by_end
+            self._node_rv[v] = [-R[i] for i in by_end]
+            if lo:
+                self._left[v] = self._new_node()
+                stk.append((self._left[v], lo))
+            if hi:
+                self._right[v] = self._new_node()
+                stk.append((self._right[v], hi))
+        return root
+
+    def _new_node(self) -> int:
+        self._center.append(0)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._node_l.append([])
+        self._node_lv.append([])
+        self._node_r.append([])
+        self._node_rv.append([])
+        return len(self._center) - 1
+
+    def __len__(self) -> int:
+        return len(self._l)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(zip(self._l, self._r))})"
+
+    def _stab_ids(self, x: int, out: List[int]) -> None:
+        v = self._root
+        while v != -1:
+            c = self._center[v]
+            if x < c:
+                # every interval here ends after c > x: report those starting at or before x
+                ids, vals = self._node_l[v], self._node_lv[v]
+                out.extend(ids[: bisect_right(vals, x)])
+                v = self._left[v]
+            else:
+                # every interval here starts at or before c <= x: report those ending after x
+                ids, vals = self._node_r[v], self._node_rv[v]
+                out.extend(ids[: bisect_left(vals, -x)])
+                if x == c:
+                    break
+                v = self._right[v]
+
+    def stab(self, x: int) -> List[P]:
+        """Payloads of all intervals containing x. O(log N + K)"""
+        ids: List[int] = []
+        self._stab_ids(x, ids)
+        return [self._payload[i] for i in ids]
+
+    def overlap(self, l: int, r: int) -> List[P]:
+        """
+        Payloads of all intervals overlapping [l, r). O(log N + K)
+        They either contain l, or start inside (l, r).
+        """
+        if l >= r:
+            return []
+        ids: List[int] = []
+        self._stab_ids(l, ids)
+        ids.extend(
+            self._by_start[bisect_right(self._sorted_l, l) : bisect_left(self._sorted_l, r)]
+        )
+        return [self._payload[i] for i in ids]
+
+    def count_stab(self, x: int) -> int:
+        """Number of intervals containing x. O(log N)"""
+        return bisect_right(self._sorted_l, x) - bisect_right(self._sorted_r, x)
+
+    def count_overlap(self, l: int, r: int) -> int:
+        """Number of intervals overlapping [l, r). O(log N)"""
+        if l >= r:
+            return 0
+        return bisect_left(self._sorted_l, r) - bisect_right(self._sorted_r, l)
+
+    # --- Batch queries: one sweep over the sorted queries instead of a tree walk per query ---
+    def _sweep(self, xs: Sequence[int]) -> List[List[int]]:
+        """
+        ids of the intervals containing xs[q], for every q. O((N + Q) log Q + sum K)
+        The queries are visited in increasing order while intervals enter at l and leave at r,
+        so the active set (an insertion-ordered dict) is exactly the answer at each query.
+        """
+        n = len(self._l)
+        by_start, sl = self._by_start, self._sorted_l
+        by_end, sr = self._by_end, self._sorted_r
+        res: List[List[int]] = [[] for _ in range(len(xs))]
+        active = {}
+        i = j = 0
+        for q in sorted(range(len(xs)), key=xs.__getitem__):
+            x = xs[q]
+            while i < n and sl[i] <= x:
+                active[by_start[i]] = None
+                i += 1
+            while j < n and sr[j] <= x:  # started earlier, so it is active
+                del active[by_end[j]]
+                j += 1
+            if active:
+                res[q] = list(active)
+        return res
+
+    def _ranks(self, vals: List[int], xs: Sequence[int], right: bool) -> List[int]:
+        """bisect_right (or bisect_left) of every x in vals, by merging with the sorted xs. O(N + Q log Q)"""
+        res = [0] * len(xs)
+        n = len(vals)
+        k = 0
+        for q in sorted(range(len(xs)), key=xs.__getitem__):
+            x = xs[q]
+            if right:
+                while k < n and vals[k] <= x:
+                    k += 1
+            else:
+                while k < n and vals[k] < x:
+                    k += 1
+            res[q] = k
+        return res
+
+    def stab_many(self, xs: Iterable[int]) -> List[List[P]]:
+        """[stab(x) for x in xs] in one sweep."""
+        pl = self._payload
+        return [[pl[i] for i in ids] for ids in self._sweep(list(xs))]
+
+    def overlap_many(self, queries: Iterable[Interval]) -> List[List[P]]:
+        """[overlap(l, r) for (l, r) in queries]: one sweep over the l's, plus the intervals starting in (l, r)."""
+        queries = list(queries)
+        ls = [l for l, _ in queries]
+        rs = [r for _, r in queries]
+        stabbed = self._sweep(ls)
+        lo = self._ranks(self._sorted_l, ls, True)
+        hi = self._ranks(self._sorted_l, rs, False)
+        pl, by_start = self._payload, self._by_start
+        res: List[List[P]] = []
+        for q in range(len(queries)):
+            if ls[q] >= rs[q]:
+                res.append([])
+                continue
+            ids = stabbed[q]
+            ids.extend(by_start[lo[q] : hi[q]])
+            res.append([pl[i] for i in ids])
+        return res
+
+    def count_stab_many(self, xs: Iterable[int]) -> List[int]:
+        """[count_stab(x) for x in xs], merging the sorted xs with the sorted starts and ends."""
+        xs = list(xs)
+        a = self._ranks(self._sorted_l, xs, True)
+        b = self._ranks(self._sorted_r, xs, True)
+        return [p - q for p, q in zip(a, b)]
+
+    def count_overlap_many(self, queries: Iterable[Interval]) -> List[int]:
+        """[count_overlap(l, r) for (l, r) in queries], by the same merge."""
+        queries = list(queries)
+        a = self._ranks(self._sorted_l, [r for _, r in queries], False)
+        b = self._ranks(self._sorted_r, [l for l, _ in queries], True)
+        return [p - q if l < r else 0 for p, q, (l, r) in zip(a, b, queries)]
+
+
+if __name__ == "__main__":
+
+    def test():
+        import random
+
+        for _ in range(200):
+            n = random.randint(0, 40)
+            ivs = []
+            for _ in range(n):
+                l = random.randint(0, 50)
+                ivs.append((l, l + random.randint(1, 15)))
+            tree = IntervalTree(ivs, [f"iv{i}" for i in range(n)])
+            for x in range(-2, 70):
+                want = sorted(f"iv{i}" for i, (l, r) in enumerate(ivs) if l <= x < r)
+                assert sorted(tree.stab(x)) == want
+                assert tree.count_stab(x) == len(want)
+            xs = [random.randint(-2, 70) for _ in range(50)]
+            for x, g, c in zip(xs, tree.stab_many(xs), tree.count_stab_many(xs)):
+                assert sorted(g) == sorted(tree.stab(x)) and c == tree.count_stab(x)
+            queries = [(random.randint(-2, 70), random.randint(-2, 70)) for _ in range(50)]
+            got = tree.overlap_many(queries)
+            cnt = tree.count_overlap_many(queries)
+            for (ql, qr), g, c in zip(queries, got, cnt):
+                want = sorted(f"iv{i}" for i, (l, r) in enumerate(ivs) if l < qr and ql < r and ql < qr)
+                assert sorted(g) == want and c == len(want)
+        print("All tests passed!")
+
+    def bench(n=10**5, q=10**5):
+        import random
+        import time
+
+        ivs = []
+        for _ in range(n):
+            l = random.randrange(10**9)
+            ivs.append((l, l + random.randint(1, 10**5)))
+        tree = IntervalTree(ivs)
+        xs = [random.randrange(10**9) for _ in range(q)]
+        qs = [(x, x + random.randint(1, 10**5)) for x in xs]
+        for name, single, batch, args in (
+            ("stab", lambda x: tree.stab(x), tree.stab_many, xs),
+            ("overlap", lambda lr: tree.overlap(*lr), tree.overlap_many, qs),
+            ("count_stab", lambda x: tree.count_stab(x), tree.count_stab_many, xs),
+        ):
+            t = time.perf_counter()
+            want = [single(a) for a in args]
+            t1 = time.perf_counter()
+            got = batch(args)
+            t2 = time.perf_counter()
+            if name == "count_stab":
+                assert got == want
+            else:
+                assert [sorted(g) for g in got] == [sorted(w) for w in want]
+            print(f"{name:10s} per query {t1 - t:.2f}s, batch {t2 - t1:.2f}s")
+
+    test()
+    # bench()
@@ -0,0 +1,238 @@
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+
+Push = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+class Tree:
+    """
+    Undirected tree in CSR form with a BFS order from root, for vectorized rerooting.
+
+    Rerooting here is restricted to additive (group-valued) folds, i.e. Graph_T with
+    - braid(x, y) = x + y (elementwise)
+    - augment(wv, t) = wv + t for vertices
+    - augment(we, x) = push(x, e) for edges, any vectorized function.
+    Since + is invertible, the value coming from the parent side is "parent answer minus own contribution",
+    so both passes are level-wise array operations.
+
+    Every pass loops over the BFS levels: O(height) numpy calls of total size O(N).
+    Random or shallow trees take seconds at N = 10**7; a path degenerates to N tiny calls (use Graph_T there).
+    """
+
+    def __init__(self, n: int, u: np.ndarray, v: np.ndarray, root: int = 0):
+        """
+        :param n: number of vertices.
+        :param u, v: endpoints of the n - 1 edges; edge ids passed to push are indices into them.
+        """
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        if n <= 0:
+            raise ValueError("tree must have at least one vertex")
+        if len(u) != n - 1 or len(v) != n - 1:
+            raise ValueError("a tree on n vertices has n - 1 edges")
+        if not 0 <= root < n:
+            raise IndexError(root)
+        if n > 1 and (min(u.min(), v.min()) < 0 or max(u.max(), v.max()) >= n):
+            raise IndexError("edge endpoint out of range")
+        self.n = n
+        self.root = root
+
+        # --- CSR ---
+        src = np.concatenate((u, v))
+        dst = np.concatenate((v, u))
+        eid = np.concatenate((np.arange(n - 1), np.arange(n - 1)))
+        perm = np.argsort(src)
+        self.off = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.off[1:])
+        self.to = dst[perm]
+        self.eid = eid[perm]
+
+        self.order, self.parent, self.parent_edge, self.levels = self._bfs()
+
+        # The passes run in BFS-position space: each level is a contiguous slice
+        # and the parent positions of a level are nondecreasing.
+        pos = np.empty(n, dtype=np.int64)
+        pos[self.order] = np.arange(n)
+        self._par_pos = np.where(self.parent[self.order] >= 0, pos[self.parent[self.order]], -1)
+        self._pe_pos = self.parent_edge[self.order]
+
+    def _bfs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[int]]:
+        """Frontier-at-a-time BFS; each level is expanded with one np.repeat."""
+        n, off, to, eid = self.n, self.off, self.to, self.eid
+        parent = np.full(n, -1, dtype=np.int64)
+        parent_edge = np.full(n, -1, dtype=np.int64)
+        chunks = [np.array([self.root], dtype=np.int64)]
+        levels = [0, 1]  # order[levels[d]:levels[d + 1]] are the vertices at depth d
+
+        frontier = chunks[0]
+        while True:
+            starts = off[frontier]
+            cnt = off[frontier + 1] - starts
+            tot = int(cnt.sum())
+            if tot == 0:
+                break
+            which = np.repeat(np.arange(len(frontier)), cnt)
+            idx = np.arange(tot) + np.repeat(starts - (np.cumsum(cnt) - cnt), cnt)
+            par = frontier[which]
+            nxt = to[idx]
+            keep = nxt != parent[par]
+            nxt, par, e = nxt[keep], par[keep], eid[idx[keep]]
+            if len(nxt) == 0:
+                break
+            if levels[-1] + len(nxt) > n:
+                raise ValueError("edges contain a cycle")
+            parent[nxt] = par
+            parent_edge[nxt] = e
+            chunks.append(nxt)
+            levels.append(levels[-1] + len(nxt))
+            frontier = nxt
+
+        order = np.concatenate(chunks)
+        seen = np.zeros(n, dtype=np.bool_)
+        seen[order] = True
+        if levels[-1] != n or not seen.all():
+            raise ValueError("edges do not form a tree")
+        return order, parent, parent_edge, levels
+
+    @property
+    def height(self) -> int:
+        return len(self.levels) - 2
+
+    def _bottom_up(self, base: np.ndarray, push: Push) -> Tuple[np.ndarray, np.ndarray]:
+        """bottom_up in BFS-position space."""
+        down = np.asarray(base)[self.order]
+        contrib = np.zeros_like(down)
+        pp, pe, lv = self._par_pos, self._pe_pos, self.levels
+        for d in range(len(lv) - 2, 0, -1):
+            lo, hi = lv[d], lv[d + 1]
+            c = push(down[lo:hi], pe[lo:hi])
+            contrib[lo:hi] = c
+            # siblings are contiguous: one segment sum per parent
+            par = pp[lo:hi]
+            heads = np.flatnonzero(np.concatenate(([True], par[1:] != par[:-1])))
+            down[par[heads]] += np.add.reduceat(c, heads, axis=0)
+        return down, contrib
+
+    def _to_vertices(self, a: np.ndarray) -> np.ndarray:
+        res = np.empty_like(a)
+        res[self.order] = a
+        return res
+
+    def bottom_up(self, base: np.ndarray, push: Push) -> np.ndarray:
+        """
+        Returns down where down[v] = base[v] + sum(push(down[c], e) for children c), rooted at self.root.
+        """
+        down, _ = self._bottom_up(base, push)
+        return self._to_vertices(down)
+
+    def rerooting(self, base: np.ndarray, push: Push) -> np.ndarray:
+        """
+        Returns full where full[v] is the fold with v as the root. O(N) work in O(height) numpy calls.
+
+        :param base: per-vertex weights, shape (n,) or (n, k).
+        :param push: push(vals, edge_ids) -> contributions; vals[i] is carried over edge edge_ids[i].
+        """
+        full, contrib = self._bottom_up(base, push)  # the root is already final
+        pp, pe, lv = self._par_pos, self._pe_pos, self.levels
+        for d in range(1, len(lv) - 1):
+            lo, hi = lv[d], lv[d + 1]
+            full[lo:hi] += push(full[pp[lo:hi]] - contrib[lo:hi], pe[lo:hi])
+        return self._to_vertices(full)
+
+    # --- Common folds ---
+    def subtree_sizes(self) -> np.ndarray:
+        """Subtree sizes when rooted at self.root."""
+        return self.bottom_up(np.ones(self.n, dtype=np.int64), lambda x, e: x)
+
+    def distance_sums(self, w: Optional[np.ndarray] = None) -> np.ndarray:
+        """res[v] = sum(dist(v, u) for all u); w[e] is the length of edge e (default 1)."""
+        if w is None:
+            w = np.ones(self.n - 1, dtype=np.int64)
+        w = np.asarray(w)
+
+        def push(x: np.ndarray, e: np.ndarray) -> np.ndarray:
+            # x[:, 0]: sum of distances into the subtree, x[:, 1]: its size
+            y = x.copy()
+            y[:, 0] += w[e] * x[:, 1]
+            return y
+
+        base = np.zeros((self.n, 2), dtype=np.result_type(w, np.int64))
+        base[:, 1] = 1
+        return self.rerooting(base, push)[:, 0]
+
+
+if __name__ == "__main__":
+    import sys
+
+    def typical_039():
+        """
+        sum_{u=1}^{N-1} sum_{v=u+1}^{N} dist(u,v)
+        """
+        data = np.array(sys.stdin.buffer.read().split(), dtype=np.int64)
+        n = int(data[0])
+        ab = data[1:].reshape(-1, 2) - 1
+        tree = Tree(n, ab[:, 0], ab[:, 1])
+        print(int(tree.distance_sums().sum(dtype=object)) // 2)
+
+    def test():
+        import random
+        from simple_v_based import Graph_T
+
+        def braid(x, y):
+            return (x[0] + y[0], x[1] + y[1])
+
+        def augment(x, y):
+            return (x[0] * y[1] + y[0], x[1] + y[1])
+
+        for _ in range(200):
+            n = random.randint(1, 40)
+            p = [random.randrange(v) for v in range(1, n)]
+            ch = list(range(1, n))
+            w = [random.randint(1, 5) for _ in range(n - 1)]
+            edges = [(a, b) if random.random() < 0.5 else (b, a) for a, b in zip(p, ch)]
+            u = [a for a, _ in edges]
+            v = [b for _, b in edges]
+            root = random.randrange(n)
+            tree = Tree(n, np.array(u, dtype=np.int64), np.array(v, dtype=np.int64), root)
+
+            g = Graph_T(n, braid, augment)
+            for x in range(n):
+                g.add_vertex(x, (0, 1))
+            for a, b, we in zip(u, v, w):
+                g.add_undirected_edge(a, b, (we, 0))
+            want = [s for s, _ in g.rerooting()]
+            assert tree.distance_sums(np.array(w)).tolist() == want
+
+            sizes = tree.subtree_sizes()
+            assert sizes[root] == n
+            for x in range(n):
+                if x != root:
+                    assert sizes[x] == 1 + sum(sizes[c] for c in range(n) if tree.parent[c] == x)
+
+        for bad in ([(0, 1), (1, 0)], [(0, 1), (2, 2)]):
+            try:
+                Tree(3, *map(np.array, zip(*bad)))
+                assert False
+            except ValueError:
+                pass
+        print("All tests passed!")
+
+    def bench(n=10**7):
+        import time
+
+        rng = np.random.default_rng(0)
+        t0 = time.perf_counter()
+        ch = np.arange(1, n)
+        p = (rng.random(n - 1) * ch).astype(np.int64)  # random recursive tree
+        t1 = time.perf_counter()
+        tree = Tree(n, p, ch)
+        t2 = time.perf_counter()
+        res = tree.distance_sums()
+        t3 = time.perf_counter()
+        print(f"n = {n}, height = {tree.height}")
+        print(f"generate {t1 - t0:.2f}s, CSR + BFS {t2 - t1:.2f}s, distance_sums {t3 - t2:.2f}s")
+        print(int(res.sum(dtype=object)) // 2)
+
+    typical_039()
+    # test()
+    # bench()
@@ -0,0 +1,405 @@
+from typing import *
+
+T = TypeVar("T")
+F = TypeVar("F")
+
+
+class _SegTree(Generic[T]):
+    """Point-update / range-product segment tree where None is the identity."""
+
+    __slots__ = ("n", "op", "_data")
+
+    def __init__(self, arr: Sequence[Optional[T]], op: Callable[[T, T], T]):
+        self.n = len(arr)
+        self.op = op
+        self._data: List[Optional[T]] = [None] * (self.n << 1)
+        self._data[self.n :] = arr
+        for i in range(self.n - 1, 0, -1):
+            self._data[i] = self._op(self._data[i << 1], self._data[i << 1 | 1])
+
+    def _op(self, a: Optional[T], b: Optional[T]) -> Optional[T]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return self.op(a, b)
+
+    def get(self, i: int) -> Optional[T]:
+        return self._data[self.n + i]
+
+    def set(self, i: int, x: Optional[T]) -> None:
+        d, op = self._data, self.op
+        i += self.n
+        d[i] = x
+        while i > 1:
+            i >>= 1
+            a, b = d[i << 1], d[i << 1 | 1]
+            d[i] = b if a is None else a if b is None else op(a, b)
+
+    def all_prod(self) -> Optional[T]:
+        return self._data[1] if self.n else None
+
+    def prod(self, l: int, r: int) -> Optional[T]:
+        res_left, res_right = None, None
+        l += self.n
+        r += self.n
+        while l < r:
+            if l & 1:
+                res_left = self._op(res_left, self._data[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                res_right = self._op(self._data[r], res_right)
+            l >>= 1
+            r >>= 1
+        return self._op(res_left, res_right)
+
+
+class DynamicRerooting(Generic[T, F]):
+    """
+    Rerooting over an undirected tree that stays valid under vertex / edge weight updates.
+    Same braid / augment contract as Graph_T.rerooting.
+
+    The tree is heavy-light decomposed from vertex 0. Seen from one end of a heavy path,
+    each vertex acts as a map on the value arriving from the other end:
+        y -> augment(wv, braid(L_v, augment(we, y)))
+    where L_v is the braid over the light children. These maps are kept in two segment trees per path
+    (one composed downwards, one upwards) and L_v in a segment tree over the light children of v,
+    so update_vertex, update_edge and query_root each touch O(log N) paths: O(log^2 N).
+
+    The maps need a closed representation, given by the caller:
+        lift(x, L): the map y -> augment(x, braid(L, y)), or y -> augment(x, y) if L is None
+        compose(f, g): f . g (apply g first)
+        apply(f, y): f(y)
+    """
+
+    def __init__(
+        self,
+        n: int,
+        braid: Callable[[T, T], T],
+        augment: Callable[[T, T], T],
+        lift: Callable[[T, Optional[T]], F],
+        compose: Callable[[F, F], F],
+        apply: Callable[[F, T], T],
+        edges: Iterable[Tuple[int, int, T]],
+        vertex_weights: Sequence[T],
+    ):
+        """
+        :param edges: (v, nv, we) triples; must form a tree on n vertices.
+        :param vertex_weights: vertex_weights[v] is the weight of v.
+        """
+        if n <= 0:
+            raise ValueError("tree must have at least one vertex")
+        if len(vertex_weights) != n:
+            raise ValueError("vertex_weights must have length n")
+        self.n = n
+        self.braid = braid
+        self.augment = augment
+        self.lift = lift
+        self.compose = compose
+        self.apply = apply
+        self._w: List[T] = list(vertex_weights)
+
+        adj: List[List[Tuple[int, T]]] = [[] for _ in range(n)]
+        m = 0
+        for v, nv, we in edges:
+            if not (0 <= v < n and 0 <= nv < n):
+                raise IndexError
+            adj[v].append((nv, we))
+            adj[nv].append((v, we))
+            m += 1
+        if m != n - 1:
+            raise ValueError("a tree on n vertices has n - 1 edges")
+
+        # --- rooted at 0 ---
+        parent = [-1] * n
+        self._pw: List[Optional[T]] = [None] * n  # weight of the edge to the parent
+        order = [0]
+        visited = [False] * n
+        visited[0] = True
+        for v in order:
+            for nv, we in adj[v]:
+                if not visited[nv]:
+                    visited[nv] = True
+                    parent[nv] = v
+                    self._pw[nv] = we
+                    order.append(nv)
+        if len(order) != n:
+            raise ValueError("edges do not form a tree")
+        self._parent = parent
+
+        size = [1] * n
+        heavy = [-1] * n
+        for v in reversed(order):
+            p = parent[v]
+            if p != -1:
+                size[p] += size[v]
+        for v in order[1:]:
+            p = parent[v]
+            if heavy[p] == -1 or size[v] > size[heavy[p]]:
+                heavy[p] = v
+        self._heavy = heavy
+
+        # --- heavy paths; v is the _idx[v]-th vertex of the path starting at _top[v] ---
+        self._top = [0] * n
+        self._idx = [0] * n
+        self._bottom = [0] * n  # last vertex of the path (valid for tops)
+        paths: List[List[int]] = []
+        for t in order:
+            if t == 0 or heavy[parent[t]] != t:
+                path = []
+                v = t
+                while v != -1:
+                    self._top[v] = t
+                    self._idx[v] = len(path)
+                    path.append(v)
+                    v = heavy[v]
+                self._bottom[t] = path[-1]
+                paths.append(path)
+        # the light children of v are the slots of _light[v]
+        lights: List[List[int]] = [[] for _ in range(n)]
+        self._slot = [-1] * n
+        for v in order[1:]:
+            p = parent[v]
+            if heavy[p] != v:
+                self._slot[v] = len(lights[p])
+                lights[p].append(v)
+
+        # --- initial values, bottom-up ---
+        down: List[Optional[T]] = [None] * n
+        lsum: List[Optional[T]] = [None] * n
+        self._light: List[Optional[_SegTree[T]]] = [None] * n
+        for v in reversed(order):
+            acc = None
+            if lights[v]:
+                vals = [augment(self._pw[c], down[c]) for c in lights[v]]
+                self._light[v] = _SegTree(vals, braid)
+                acc = self._light[v].all_prod()
+            lsum[v] = acc
+            h = heavy[v]
+            if h != -1:
+                x = augment(self._pw[h], down[h])
+                acc = x if acc is None else braid(acc, x)
+            down[v] = self._value(self._w[v], acc)
+
+        # per path: _down[t].prod(i, j) = F_i . ... . F_{j-1};  _up[t].prod(i, j) = G_{j-1} . ... . G_i
+        self._down: List[Optional[_SegTree[F]]] = [None] * n
+        self._up: List[Optional[_SegTree[F]]] = [None] * n
+        up_op = lambda a, b: compose(b, a)
+        for path in paths:
+            fs, gs = zip(*(self._maps(v, lsum[v]) for v in path))
+            self._down[path[0]] = _SegTree(fs, compose)
+            self._up[path[0]] = _SegTree(gs, up_op)
+
+    def _value(self, w: T, acc: Optional[T]) -> T:
+        return w if acc is None else self.augment(w, acc)
+
+    def _braid(self, a: Optional[T], b: Optional[T]) -> Optional[T]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return self.braid(a, b)
+
+    def _maps(self, v: int, lsum: Optional[T]) -> Tuple[Optional[F], Optional[F]]:
+        """(F_v, G_v): v seen from its parent side, and from its heavy child side."""
+        f = g = None
+        base = self.lift(self._w[v], lsum)
+        if self._heavy[v] != -1:
+            f = self.compose(base, self.lift(self._pw[self._heavy[v]], None))
+        if self._parent[v] != -1:
+            g = self.compose(base, self.lift(self._pw[v], None))
+        return f, g
+
+    def _lsum(self, v: int) -> Optional[T]:
+        seg = self._light[v]
+        return None if seg is None else seg.all_prod()
+
+    def _down_value(self, v: int) -> T:
+        """The fold of the subtree of v (rooted at 0)."""
+        t = self._top[v]
+        b = self._bottom[t]
+        if v == b:
+            return self._w[b]
+        return self.apply(self._down[t].prod(self._idx[v], self._idx[b]), self._w[b])
+
+    def _heavy_part(self, v: int) -> Optional[T]:
+        h = self._heavy[v]
+        return None if h == -1 else self.augment(self._pw[h], self._down_value(h))
+
+    def _set_maps(self, v: int) -> None:
+        f, g = self._maps(v, self._lsum(v))
+        t = self._top[v]
+        self._down[t].set(self._idx[v], f)
+        self._up[t].set(self._idx[v], g)
+
+    def _refresh(self, v: int) -> None:
+        """Recompute the maps of v and of every vertex whose light sum depends on it."""
+        while True:
+            self._set_maps(v)
+            t = self._top[v]
+            if t == 0:
+                return
+            v = self._parent[t]
+            self._light[v].set(self._slot[t], self.augment(self._pw[t], self._down_value(t)))
+
+    def update_vertex(self, v: int, wv: T) -> None:
+        """Set the weight of vertex v. O(log^2 N)"""
+        if not 0 <= v < self.n:
+            raise IndexError
+        self._w[v] = wv
+        self._refresh(v)
+
+    def update_edge(self, u: int, v: int, we: T) -> None:
+        """Set the weight of the edge (u, v). O(log^2 N)"""
+        if not (0 <= u < self.n and 0 <= v < self.n):
+            raise IndexError
+        if self._parent[v] == u:
+            c = v
+        elif self._parent[u] == v:
+            c = u
+        else:
+            raise ValueError(f"({u}, {v}) is not an edge")
+        self._pw[c] = we
+        p = self._parent[c]
+        if self._heavy[p] == c:
+            self._set_maps(c)
+            self._refresh(p)
+        else:
+            self._refresh(c)
+
+    def query_root(self, r: int) -> T:
+        """The result when r is the root, as Graph_T.rerooting()[r]. O(log^2 N)"""
+        if not 0 <= r < self.n:
+            raise IndexError
+        # r, then the parent of each path top up to the path of 0
+        chain = [r]
+        while self._top[chain[-1]] != 0:
+            chain.append(self._parent[self._top[chain[-1]]])
+
+        into_top = None  # value entering the current path top from its parent side
+        for k in range(len(chain) - 1, -1, -1):
+            u = chain[k]
+            t = self._top[u]
+            # value entering u from its parent side (before the edge)
+            if u == t:
+                x = into_top
+            else:
+                if into_top is None:
+                    x = self._value(self._w[t], self._lsum(t))
+                else:
+                    x = self.apply(self._up[t].get(0), into_top)
+                if self._idx[u] > 1:
+                    x = self.apply(self._up[t].prod(1, self._idx[u]), x)
+
+            if k == 0:
+                acc = self._lsum(u)
+            else:
+                seg = self._light[u]
+                s = self._slot[self._top[chain[k - 1]]]  # light child leading to r
+                acc = self._braid(seg.prod(0, s), seg.prod(s + 1, seg.n))
+            acc = self._braid(acc, self._heavy_part(u))
+            if x is not None:
+                acc = self._braid(acc, self.augment(self._pw[u], x))
+            into_top = self._value(self._w[u], acc)
+        return into_top
+
+
+if __name__ == "__main__":
+
+    def typical_039_dynamic():
+        """
+        sum of distances over all pairs, with edge lengths changed online.
+        T = (sum of distances, vertex count); maps (s, c) -> (s + a*c + b, c + d) are (a, b, d).
+        """
+
+        def braid(x, y):
+            return (x[0] + y[0], x[1] + y[1])
+
+        def augment(x, y):
+            return (x[0] * y[1] + y[0], x[1] + y[1])
+
+        def lift(x, L):
+            if L is None:
+                return (x[0], 0, x[1])
+            return (x[0], x[0] * L[1] + L[0], x[1] + L[1])
+
+        def compose(f, g):
+            return (f[0] + g[0], f[1] + g[1] + f[0] * g[2], f[2] + g[2])
+
+        def apply(f, y):
+            return (y[0] + f[0] * y[1] + f[1], y[1] + f[2])
+
+        n, q = map(int, input().split())
+        edges = []
+        for _ in range(n - 1):
+            u, v, w = map(int, input().split())
+            edges.append((u - 1, v - 1, (w, 0)))
+        dr = DynamicRerooting(n, braid, augment, lift, compose, apply, edges, [(0, 1)] * n)
+        for _ in range(q):
+            u, v, w, r = map(int, input().split())
+            dr.update_edge(u - 1, v - 1, (w, 0))
+            print(dr.query_root(r - 1)[0])
+
+    def test():
+        import random
+        from math import inf
+        from simple_v_based import Graph_T
+
+        def naive(n, braid, augment, edges, vws):
+            g = Graph_T.from_edges(n, braid, augment, edges, vws)
+            return g.rerooting()
+
+        # sum of distances, weighted vertices: maps (a, b, d) as in typical_039_dynamic
+        braid = lambda x, y: (x[0] + y[0], x[1] + y[1])
+        augment = lambda x, y: (x[0] * y[1] + y[0], x[1] + y[1])
+        lift = lambda x, L: (x[0], 0, x[1]) if L is None else (x[0], x[0] * L[1] + L[0], x[1] + L[1])
+        compose = lambda f, g: (f[0] + g[0], f[1] + g[1] + f[0] * g[2], f[2] + g[2])
+        apply = lambda f, y: (y[0] + f[0] * y[1] + f[1], y[1] + f[2])
+
+        for _ in range(100):
+            n = random.randint(1, 25)
+            span = random.choice((n, 2))  # random or path-like
+            edges = [(random.randrange(max(0, v - span), v), v, (random.randint(1, 5), 0)) for v in range(1, n)]
+            vws = [(0, random.randint(0, 3)) for _ in range(n)]
+            dr = DynamicRerooting(n, braid, augment, lift, compose, apply, edges, vws)
+            for _ in range(30):
+                if random.random() < 0.5 and n > 1:
+                    i = random.randrange(n - 1)
+                    u, v, _ = edges[i]
+                    edges[i] = (u, v, (random.randint(1, 5), 0))
+                    if random.random() < 0.5:
+                        u, v = v, u
+                    dr.update_edge(u, v, edges[i][2])
+                else:
+                    v = random.randrange(n)
+                    vws[v] = (0, random.randint(0, 3))
+                    dr.update_vertex(v, vws[v])
+                want = naive(n, braid, augment, edges, vws)
+                assert [dr.query_root(r) for r in range(n)] == want
+
+        # farthest vertex (abc428e): maps y -> max(y shifted by a, b) are (a, b)
+        def shift(x, a):
+            return None if x is None else (x[0] + a, x[1])
+
+        augment2 = lambda x, y: (x[0] + y[0], y[1])
+        lift2 = lambda x, L: (x[0], shift(L, x[0]))
+        compose2 = lambda f, g: (f[0] + g[0], max(filter(None, (shift(g[1], f[0]), f[1])), default=None))
+        apply2 = lambda f, y: max(filter(None, (shift(y, f[0]), f[1])))
+        for _ in range(100):
+            n = random.randint(1, 25)
+            edges = [(random.randrange(v), v, (random.randint(1, 3), -inf)) for v in range(1, n)]
+            vws = [(0, v) for v in range(n)]
+            dr = DynamicRerooting(n, max, augment2, lift2, compose2, apply2, edges, vws)
+            for _ in range(20):
+                if n > 1:
+                    i = random.randrange(n - 1)
+                    u, v, _ = edges[i]
+                    edges[i] = (u, v, (random.randint(1, 3), -inf))
+                    dr.update_edge(u, v, edges[i][2])
+                want = naive(n, max, augment2, edges, vws)
+                assert [dr.query_root(r) for r in range(n)] == want
+        print("All tests passed!")
+
+    typical_039_dynamic()
+    # test()
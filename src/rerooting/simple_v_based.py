@@ -17,12 +17,100 @@ class Graph_T:
         :param braid: (T, braid) must be commutative semigroup (associative and commutative).
         :param augment: (T, augment) must be semigroup (associative). argument order is (ancestor_side, decendant_side).
         """
+        self._init(n, braid, augment, [None] * n, None)
+
+    def _init(
+        self,
+        n: int,
+        braid: Callable[[T, T], T],
+        augment: Callable[[T, T], T],
+        vertex_weights: List[Optional[T]],
+        csr: Optional[Tuple[List[int], List[int], List[T]]],
+    ) -> None:
+        """Shared by __init__ and from_edges; with csr given, the edge lists are derived from it when needed."""
         self.n = n
         self.braid = braid
         self.augment = augment
+        self.vertex_weights = vertex_weights
+
+        # CSR: edges of v are to[off[v]:off[v + 1]] with weights w[...]; rebuilt after the edges change
+        self._csr = csr
+        self._adj: Optional[List[List[Tuple[int, T]]]] = [[] for _ in range(n)] if csr is None else None
+        self._adj_view: Optional[Tuple[Tuple[Tuple[int, T], ...], ...]] = None
+
+    @property
+    def adj_list(self) -> Tuple[Tuple[Tuple[int, T], ...], ...]:
+        """adj_list[v] = ((nv, we), ...), read-only: add edges with add_directed_edge, which keeps the CSR in sync."""
+        if self._adj_view is None:
+            if self._adj is not None:
+                self._adj_view = tuple(map(tuple, self._adj))
+            else:
+                off, to, w = self._csr
+                self._adj_view = tuple(
+                    tuple(zip(to[off[v] : off[v + 1]], w[off[v] : off[v + 1]])) for v in range(self.n)
+                )
+        return self._adj_view
 
-        self.adj_list: List[List[Tuple[int, T]]] = [[] for _ in range(n)]
-        self.vertex_weights: List[Optional[T]] = [None] * n
+    @classmethod
+    def from_edges(
+        cls,
+        n: int,
+        braid: Callable[[T, T], T],
+        augment: Callable[[T, T], T],
+        edges: Sequence[Tuple[int, int, T]],
+        vertex_weights: Sequence[T],
+        directed: bool = False,
+    ) -> "Graph_T":
+        """
+        Builds the graph straight into CSR (offsets plus flat neighbour / weight lists)
+        without per-vertex lists of tuples. O(N + M)
+
+        :param edges: (v, nv, we) triples.
+        :param vertex_weights: vertex_weights[v] is the weight of v.
+        :param directed: if False every edge is added in both directions.
+        """
+        if len(vertex_weights) != n:
+            raise ValueError("vertex_weights must have length n")
+        src = [v for v, _, _ in edges]
+        dst = [nv for _, nv, _ in edges]
+        ws = [we for _, _, we in edges]
+        if src and not (0 <= min(src) and max(src) < n and 0 <= min(dst) and max(dst) < n):
+            raise IndexError
+        if not directed:
+            src, dst, ws = src + dst, dst + src, ws + ws
+        csr = cls._pack(n, src, dst, ws)
+        g = cls.__new__(cls)
+        g._init(n, braid, augment, list(vertex_weights), csr)
+        return g
+
+    @staticmethod
+    def _pack(
+        n: int, src: List[int], dst: List[int], ws: List[T]
+    ) -> Tuple[List[int], List[int], List[T]]:
+        """Counting sort of the edges by source, stable. O(N + M)"""
+        off = [0] * (n + 1)
+        for v in src:
+            off[v + 1] += 1
+        for v in range(n):
+            off[v + 1] += off[v]
+        pos = off[:n]
+        to = [0] * len(src)
+        w: List[T] = [None] * len(src)
+        for v, nv, we in zip(src, dst, ws):
+            p = pos[v]
+            to[p] = nv
+            w[p] = we
+            pos[v] = p + 1
+        return off, to, w
+
+    def _get_csr(self) -> Tuple[List[int], List[int], List[T]]:
+        if self._csr is None:
+            adj = self._adj
+            src = [v for v, nvs in enumerate(adj) for _ in nvs]
+            dst = [nv for nvs in adj for nv, _ in nvs]
+            ws = [we for nvs in adj for _, we in nvs]
+            self._csr = self._pack(self.n, src, dst, ws)
+        return self._csr
 
     def add_vertex(self, v: int, wv: T):
         """
@@ -45,7 +133,11 @@ class Graph_T:
         """
         if not (0 <= v < self.n and 0 <= nv < self.n):
             raise IndexError
-        self.adj_list[v].append((nv, we))
+        if self._adj is None:  # built by from_edges: materialise the lists before the CSR is dropped
+            self._adj = [list(nvs) for nvs in self.adj_list]
+        self._adj[v].append((nv, we))
+        self._csr = None
+        self._adj_view = None
 
     def add_undirected_edge(self, v: int, nv: int, we: T):
         """
@@ -57,9 +149,94 @@ class Graph_T:
     def rerooting(self) -> List[T]:
         """
         Returns a list where list[v] is the result when v is the root.
+
+        Runs over the CSR arrays. augment(we, de[nv]) is computed once per edge and kept in a flat list,
+        and "all neighbours except one" is answered from a single prefix buffer of size max degree
+        plus a running suffix, so no per-vertex lists are allocated. O(N + M)
+        """
+        n = self.n
+        if n == 0:
+            return []
+        braid, augment = self.braid, self.augment
+        vw = self.vertex_weights
+        off, to, w = self._get_csr()
+
+        order = []
+        parent = [-1] * n
+        visited = [False] * n
+        stk = [0]
+        while stk:
+            v = stk.pop()
+            visited[v] = True
+            order.append(v)
+            for i in range(off[v], off[v + 1]):
+                nv = to[i]
+                if not visited[nv]:
+                    parent[nv] = v
+                    stk.append(nv)
+
+        # --- Bottom-up ---
+        ev: List[Optional[T]] = [None] * len(to)  # ev[i] = augment(w[i], de[to[i]]) for child edges
+        de = [None] * n  # down or equal
+        for v in reversed(order):
+            pv = parent[v]
+            acc = None
+            for i in range(off[v], off[v + 1]):
+                nv = to[i]
+                if nv != pv:
+                    x = augment(w[i], de[nv])
+                    ev[i] = x
+                    acc = x if acc is None else braid(acc, x)
+            de[v] = vw[v] if acc is None else augment(vw[v], acc)
+
+        # --- Top-down ---
+        pref: List[Optional[T]] = [None] * max(
+            (off[v + 1] - off[v] for v in range(n)), default=0
+        )
+        ut = [None] * n  # up than
+        ans = [None] * n
+        for v in order:
+            pv = parent[v]
+            wv = vw[v]
+            utv = ut[v]
+            a, b = off[v], off[v + 1]
+            if b - a == 1 and to[a] == pv:  # leaf
+                ans[v] = wv if utv is None else augment(wv, utv)
+                continue
+
+            acc = None
+            for i in range(a, b):
+                x = utv if to[i] == pv else ev[i]
+                if x is not None:
+                    acc = x if acc is None else braid(acc, x)
+                pref[i - a] = acc
+            ans[v] = wv if acc is None else augment(wv, acc)
+
+            suf = None
+            for i in range(b - 1, a - 1, -1):
+                nv = to[i]
+                if nv == pv:
+                    x = utv
+                else:
+                    p = pref[i - a - 1] if i > a else None
+                    if p is None:
+                        others = suf
+                    else:
+                        others = p if suf is None else braid(p, suf)
+                    ut[nv] = augment(w[i], wv if others is None else augment(wv, others))
+                    x = ev[i]
+                if x is not None:
+                    suf = x if suf is None else braid(x, suf)
+
+        return ans
+
+    def _rerooting_lists(self) -> List[T]:
+        """
+        Reference implementation on adj_list; builds out_vals / pref / suff lists for every vertex.
         """
         if self.n == 0:
             return []
+        adj_list = self.adj_list
 
         order = []
         parent = [None] * self.n
@@ -70,7 +247,7 @@ class Graph_T:
             v = stk.pop()
             visited[v] = True
             order.append(v)
-            for nv, we in self.adj_list[v]:
+            for nv, we in adj_list[v]:
                 if visited[nv]:
                     continue
                 parent[nv] = v
@@ -82,7 +259,7 @@ class Graph_T:
         for v in reversed(order):
             pv = parent[v]
             wv = self.vertex_weights[v]
-            nvs = self.adj_list[v]
+            nvs = adj_list[v]
             k = len(nvs)
 
             dt = (
@@ -101,7 +278,7 @@ class Graph_T:
         for v in order:
             pv = parent[v]
             wv = self.vertex_weights[v]
-            nvs = self.adj_list[v]
+            nvs = adj_list[v]
             k = len(nvs)
 
             out_vals = [
@@ -232,6 +409,98 @@ if __name__ == "__main__":
         print(ans)
         return
 
+    def typical_039_ops():
+        def braid(x, y):
+            return (x[0] + y[0], x[1] + y[1])
+
+        def augment(x, y):
+            return (x[0] * y[1] + y[0], x[1] + y[1])
+
+        return braid, augment
+
+    def random_tree(n, seed=None):
+        import random
+
+        rng = random.Random(seed)
+        return [(rng.randrange(v), v, (1, 0)) for v in range(1, n)]
+
+    def test():
+        import random
+
+        braid, augment = typical_039_ops()
+        for _ in range(300):
+            n = random.randint(1, 30)
+            edges = random_tree(n)
+            random.shuffle(edges)
+            vws = [(0, random.randint(1, 3)) for _ in range(n)]
+            for directed in (False, True):
+                g_old = Graph_T(n, braid, augment)
+                for v, wv in enumerate(vws):
+                    g_old.add_vertex(v, wv)
+                for u, v, we in edges:
+                    if directed:
+                        g_old.add_directed_edge(u, v, we)
+                    else:
+                        g_old.add_undirected_edge(u, v, we)
+                g_csr = Graph_T.from_edges(n, braid, augment, edges, vws, directed)
+                want = g_old._rerooting_lists()
+                assert g_old.rerooting() == want
+                assert g_csr.rerooting() == want
+
+                # the list path still works after a CSR build
+                g_csr.add_vertex(0, (0, 5))
+                g_old.add_vertex(0, (0, 5))
+                if directed and edges:
+                    u, v, we = edges[0]
+                    g_csr.add_directed_edge(v, u, we)
+                    g_old.add_directed_edge(v, u, we)
+                assert g_csr.rerooting() == g_old._rerooting_lists()
+                assert [sorted(r) for r in g_csr.adj_list] == [sorted(r) for r in g_old.adj_list]
+                try:  # a read-only view, so it cannot drift from the cached CSR
+                    g_old.adj_list[0].append((0, 1))
+                    assert False
+                except AttributeError:
+                    pass
+
+        # max / non-tuple values: farthest vertex (abc428e)
+        for _ in range(100):
+            n = random.randint(1, 30)
+            edges = [(u, v, (1, -inf)) for u, v, _ in random_tree(n)]
+            aug = lambda x, y: (x[0] + y[0], y[1])
+            g = Graph_T.from_edges(n, max, aug, edges, [(0, v) for v in range(n)])
+            assert g.rerooting() == g._rerooting_lists()
+        print("All tests passed!")
+
+    def bench(n=10**6):
+        import time
+
+        braid, augment = typical_039_ops()
+        edges = random_tree(n, seed=0)
+
+        t0 = time.perf_counter()
+        g_old = Graph_T(n, braid, augment)
+        for v in range(n):
+            g_old.add_vertex(v, (0, 1))
+        for u, v, we in edges:
+            g_old.add_undirected_edge(u, v, we)
+        t1 = time.perf_counter()
+        want = g_old._rerooting_lists()
+        t2 = time.perf_counter()
+        del g_old
+
+        t3 = time.perf_counter()
+        g_csr = Graph_T.from_edges(n, braid, augment, edges, [(0, 1)] * n)
+        t4 = time.perf_counter()
+        got = g_csr.rerooting()
+        t5 = time.perf_counter()
+        assert got == want
+
+        print(f"n = {n}")
+        print(f"lists: build {t1 - t0:.2f}s, rerooting {t2 - t1:.2f}s")
+        print(f"CSR:   build {t4 - t3:.2f}s, rerooting {t5 - t4:.2f}s")
+
     apg4b_ex20()
     # abc428e()
     # typical_039()
+    # test()
+    # bench()
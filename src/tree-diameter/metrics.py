@@ -0,0 +1,282 @@
+from typing import NamedTuple, Optional, Tuple
+import numpy as np
+
+
+class TreeMetrics(NamedTuple):
+    diameter: int  # weighted length of a longest path
+    radius: int  # min eccentricity
+    eccentricity: np.ndarray  # eccentricity[v] = max distance from v
+    farthest: np.ndarray  # farthest[v] = a vertex at distance eccentricity[v] from v
+    centers: np.ndarray  # vertices with eccentricity == radius
+    path: np.ndarray  # a diameter path, from one endpoint to the other
+
+
+def _list_rank(succ: np.ndarray, start: int, idx) -> np.ndarray:
+    """
+    Position of every element on the cycle succ, counted from start. O(M) work, vectorized.
+
+    Random splitters (about 1 in 256) cut the cycle into short runs, which are walked in lockstep;
+    only the runs themselves are then chained in Python.
+    """
+    m = len(succ)
+    rng = np.random.default_rng(0)
+    is_split = rng.random(m) < 1 / 256
+    is_split[start] = True
+    spl = np.flatnonzero(is_split).astype(idx)
+    k = len(spl)
+
+    sid = np.empty(m, dtype=idx)  # run of each element
+    off = np.empty(m, dtype=idx)  # offset in the run
+    sid[spl] = np.arange(k, dtype=idx)
+    off[spl] = 0
+    nxt = np.empty(k, dtype=idx)
+    gap = np.empty(k, dtype=idx)
+
+    act = np.arange(k, dtype=idx)
+    cur = succ[spl]
+    step = 1
+    while len(act):
+        hit = is_split[cur]
+        if hit.any():
+            nxt[act[hit]] = sid[cur[hit]]
+            gap[act[hit]] = step
+            keep = ~hit
+            act, cur = act[keep], cur[keep]
+        sid[cur] = act
+        off[cur] = step
+        cur = succ[cur]
+        step += 1
+
+    base = [0] * k
+    nxt_l, gap_l = nxt.tolist(), gap.tolist()
+    s0 = s = int(sid[start])
+    acc = 0
+    while True:
+        base[s] = acc
+        acc += gap_l[s]
+        s = nxt_l[s]
+        if s == s0:
+            break
+    if acc != m:
+        raise ValueError("succ is not a single cycle")
+    return np.asarray(base, dtype=idx)[sid] + off
+
+
+class _EulerTour:
+    """
+    CSR of an undirected tree plus its Euler tour (the cycle of directed edges u->v -> v->w,
+    where w follows u in the adjacency of v).
+    Rooting the tour at any vertex gives the distances from it with one cumsum, for any tree shape.
+    """
+
+    def __init__(self, n: int, u: np.ndarray, v: np.ndarray, w: Optional[np.ndarray]):
+        idx = np.int32 if 2 * n < 2**31 else np.int64
+        self.n = n
+        self.m = m = 2 * (n - 1)
+        u = np.asarray(u).astype(idx)
+        v = np.asarray(v).astype(idx)
+        if len(u) != n - 1 or len(v) != n - 1:
+            raise ValueError("a tree on n vertices has n - 1 edges")
+        if n > 1 and (min(u.min(), v.min()) < 0 or max(u.max(), v.max()) >= n):
+            raise IndexError("edge endpoint out of range")
+        if w is None:
+            w = np.ones(n - 1, dtype=np.int64)
+        w = np.asarray(w)
+        if len(w) != n - 1:
+            raise ValueError("w must have one weight per edge")
+        if n > 1 and w.min() < 0:
+            raise ValueError("weights must be non-negative")
+
+        src = np.concatenate((u, v))
+        perm = np.argsort(src).astype(idx)  # CSR slot -> input edge (j or j + n - 1 for v->u)
+        self.off = np.zeros(n + 1, dtype=idx)
+        np.cumsum(np.bincount(src, minlength=n), out=self.off[1:])
+        del src
+        self.to = np.concatenate((v, u))[perm]
+        self.w = np.concatenate((w, w))[perm]
+        inv = np.empty(m, dtype=idx)
+        inv[perm] = np.arange(m, dtype=idx)
+        perm += n - 1
+        perm[perm >= m] -= m
+        self.rev = inv[perm]  # slot of the reverse edge
+        del perm, inv
+
+        if m == 0:
+            return
+        if np.any(self.off[1:] == self.off[:-1]):
+            raise ValueError("edges do not form a tree")
+        nxt = self.rev + 1
+        to = self.to
+        succ = np.where(nxt < self.off[to + 1], nxt, self.off[to])
+        del nxt
+        try:
+            self.pos = _list_rank(succ, 0, idx)
+        except ValueError:
+            raise ValueError("edges do not form a tree") from None
+        del succ
+
+        # everything below is in tour order, so rooting the tour at s is a rotation
+        tour = np.empty(m, dtype=idx)
+        tour[self.pos] = np.arange(m, dtype=idx)
+        self.t_to = self.to[tour]
+        self.t_w = self.w[tour]
+        self.t_rev = self.pos[self.rev[tour]]  # tour index of the reverse edge
+        del tour, self.to, self.w, self.rev
+
+    def distances(self, s: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(weighted distance, number of edges) from s to every vertex. O(N), O(N log N) for float weights"""
+        n, m = self.n, self.m
+        if not 0 <= s < n:
+            raise IndexError(s)
+        if m == 0:
+            return np.zeros(n, dtype=np.result_type(self.w, np.int64)), np.zeros(n, dtype=np.int64)
+        # the tour rooted at s starts with the first edge out of s
+        shift = int(self.pos[self.off[s]])
+        rev = np.roll(self.t_rev, -shift) - shift
+        rev[rev < 0] += m
+        down = np.arange(m) < rev  # walked away from s before its reverse
+        to = np.roll(self.t_to, -shift)[down]
+
+        dist = np.zeros(n, dtype=np.result_type(self.t_w, np.int64))
+        hops = np.zeros(n, dtype=np.int64)
+        w = np.roll(self.t_w, -shift)
+        hops[to] = np.cumsum(np.where(down, 1, -1))[down]
+        if dist.dtype.kind in "iu":
+            dist[to] = np.cumsum(np.where(down, w, -w))[down]
+            return dist, hops
+
+        # float weights: the +-w prefix sums would carry the rounding error of every edge walked
+        # before, so add up the root paths by pointer doubling instead (only non-negative terms)
+        anc = np.arange(n)
+        anc[to] = np.roll(self.t_to, 1 - shift)[down]  # a down edge leaves the vertex the previous one entered
+        dist[to] = w[down]
+        while True:
+            nxt = anc[anc]
+            if np.array_equal(nxt, anc):
+                return dist, hops
+            dist += dist[anc]
+            anc = nxt
+
+
+def tree_metrics(n: int, u: np.ndarray, v: np.ndarray, w: Optional[np.ndarray] = None) -> TreeMetrics:
+    """
+    Diameter, eccentricities, center(s) and radius of a tree with non-negative edge weights.
+
+    Three traversals: from 0 to find a diameter end a, from a to find the other end b, and from b.
+    Then eccentricity[v] = max(d(a, v), d(b, v)). Each traversal is one rooting of the Euler tour,
+    so the cost is O(N) array work with no per-level Python loop, even on a path.
+
+    :param u, v: endpoints of the n - 1 edges.
+    :param w: edge lengths (default 1).
+    """
+    if n <= 0:
+        raise ValueError("tree must have at least one vertex")
+    et = _EulerTour(n, u, v, w)
+    d0, _ = et.distances(0)
+    a = int(np.argmax(d0))
+    da, ha = et.distances(a)
+    b = int(np.argmax(da))
+    db, hb = et.distances(b)
+
+    ecc = np.maximum(da, db)
+    far = np.where(da >= db, a, b)
+    radius = ecc.min()
+    if ecc.dtype.kind == "f":
+        # equal eccentricities can come out of different sums of the same float weights
+        is_center = np.isclose(ecc, radius, rtol=1e-9, atol=0)
+    else:
+        is_center = ecc == radius
+    on_path = np.flatnonzero(ha + hb == ha[b])
+    path = on_path[np.argsort(ha[on_path])]
+    return TreeMetrics(
+        diameter=da[b].item(),
+        radius=radius.item(),
+        eccentricity=ecc,
+        farthest=far,
+        centers=np.flatnonzero(is_center),
+        path=path,
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    def main():
+        """diameter of an unweighted tree (number of vertices on a longest path)"""
+        data = np.array(sys.stdin.buffer.read().split(), dtype=np.int64)
+        n = int(data[0])
+        uv = data[1:].reshape(-1, 2) - 1
+        res = tree_metrics(n, uv[:, 0], uv[:, 1])
+        print(res.diameter + 1)
+
+    def test():
+        import random
+        from collections import deque
+
+        for _ in range(300):
+            n = random.randint(1, 30)
+            edges = [(random.randrange(v), v) if random.random() < 0.5 else (v, random.randrange(v)) for v in range(1, n)]
+            random.shuffle(edges)
+            kind = random.choice(("unit", "int", "float"))
+            # multiples of 0.1 make ties that rounding could split
+            w = [{"unit": 1, "int": random.randint(0, 5), "float": random.randint(0, 50) / 10}[kind] for _ in edges]
+            u = [a for a, _ in edges]
+            v = [b for _, b in edges]
+            res = tree_metrics(n, np.array(u, dtype=np.int64), np.array(v, dtype=np.int64), np.array(w))
+            if kind == "float":
+                eq = lambda x, y: abs(x - y) <= 1e-9 * max(abs(x), abs(y), 1)
+            else:
+                eq = lambda x, y: x == y
+
+            adj = [[] for _ in range(n)]
+            for (a, b), c in zip(edges, w):
+                adj[a].append((b, c))
+                adj[b].append((a, c))
+
+            def bfs(s):
+                dist = [None] * n
+                dist[s] = 0
+                q = deque([s])
+                while q:
+                    x = q.popleft()
+                    for y, c in adj[x]:
+                        if dist[y] is None:
+                            dist[y] = dist[x] + c
+                            q.append(y)
+                return dist
+
+            all_d = [bfs(s) for s in range(n)]
+            ecc = [max(d) for d in all_d]
+            assert all(map(eq, res.eccentricity.tolist(), ecc))
+            assert eq(res.diameter, max(ecc)) and eq(res.radius, min(ecc))
+            assert res.centers.tolist() == [x for x in range(n) if eq(ecc[x], min(ecc))]
+            assert all(eq(all_d[x][f], ecc[x]) for x, f in enumerate(res.farthest.tolist()))
+            p = res.path.tolist()
+            assert all(any(y == b for y, _ in adj[a]) for a, b in zip(p, p[1:]))
+            assert eq(sum(all_d[a][b] for a, b in zip(p, p[1:])), res.diameter)
+
+        try:
+            tree_metrics(4, np.array([0, 1, 2]), np.array([1, 0, 3]))
+            assert False
+        except ValueError:
+            pass
+        print("All tests passed!")
+
+    def bench(n=10**7):
+        import time
+
+        rng = np.random.default_rng(0)
+        ch = np.arange(1, n)
+        shapes = {
+            "random": (rng.random(n - 1) * ch).astype(np.int64),
+            "path": ch - 1,
+            "caterpillar": (ch - 1) // 2 * 2,
+        }
+        for name, par in shapes.items():
+            t = time.perf_counter()
+            res = tree_metrics(n, par, ch, rng.integers(1, 10**6, n - 1))
+            print(f"{name:12s} n = {n}: {time.perf_counter() - t:.2f}s, diameter = {res.diameter}")
+
+    main()
+    # test()
+    # bench()
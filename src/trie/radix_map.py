@@ -0,0 +1,453 @@
+from typing import *
+from itertools import chain
+
+T = TypeVar("T", bound=Hashable)
+V = TypeVar("V")
+
+
+class RadixNode(Generic[T, V]):
+    __slots__ = (
+        "children",
+        "label",
+        "value",
+        "has_value",
+        "_token",
+        "parent",
+        "_sorted",
+    )
+
+    def __init__(
+        self,
+        parent: Optional["RadixNode[T, V]"] = None,
+        label: Sequence[T] = (),
+    ) -> None:
+        # children are keyed by the first element of their edge label
+        self.children: Dict[T, "RadixNode[T, V]"] = {}
+        self.label: Sequence[T] = label
+        self.value: Optional[V] = None
+        self.has_value: bool = False
+        self._token: int = 0
+        self.parent = parent
+        # sorted child keys, cached until the set of children changes
+        self._sorted: Optional[List[T]] = None
+
+    def __repr__(self):
+        return f"{self.value}"
+
+
+class NodeRef(Generic[T, V]):
+    __slots__ = ("_node", "_token")
+
+    def __init__(self, node: RadixNode[T, V], token: int):
+        self._node = node
+        self._token = token
+
+    def is_valid(self) -> bool:
+        return self._node.has_value and (self._node._token == self._token)
+
+
+def _as_seq(key: Sequence[T]) -> Sequence[T]:
+    """str / bytes / tuple are sliced as is; any other sequence becomes a tuple."""
+    if isinstance(key, (str, bytes, tuple)):
+        return key
+    return tuple(key)
+
+
+def _join(parts: Iterable[Sequence[T]], empty: Sequence[T]) -> Sequence[T]:
+    if isinstance(empty, tuple):
+        return tuple(chain.from_iterable(parts))
+    return empty.join(parts)
+
+
+class RadixTrieMap(Generic[T, V]):
+    """
+    Path-compressed (Patricia) variant of TrieMap (Sequence[T] -> V).
+
+    Edges carry whole key segments, so a lookup costs one dict access and one
+    slice comparison per branching node instead of one per key element.
+    Nodes are split on insert and merged back on delete.
+    All keys of one map must share a type: str, bytes or tuple (other sequences are converted to tuple).
+    """
+
+    def __init__(self, default_factory: Optional[Callable[[], V]] = None) -> None:
+        self.root: RadixNode[T, V] = RadixNode()
+        self.default_factory = default_factory
+        self._size: int = 0
+        self._empty: Sequence[T] = ()  # key[:0] of the inserted keys
+
+    @classmethod
+    def from_sorted(
+        cls,
+        items: Iterable[Tuple[Sequence[T], V]],
+        default_factory: Optional[Callable[[], V]] = None,
+    ) -> "RadixTrieMap[T, V]":
+        """
+        Build a RadixTrieMap from (key, value) pairs in ascending key order. O(total key length)
+        Nodes on the path of the previous key are kept on a stack with their depth;
+        each key pops to its common prefix, splits at most one edge and adds one leaf.
+        A repeated key keeps the last value.
+        """
+        trie = cls(default_factory)
+        stk: List[Tuple[RadixNode[T, V], int]] = [(trie.root, 0)]
+        prev: Optional[Sequence[T]] = None
+
+        for key, value in items:
+            key = _as_seq(key)
+            d = 0
+            if prev is not None:
+                lim = min(len(key), len(prev))
+                while d < lim and key[d] == prev[d]:
+                    d += 1
+                if (d < lim and key[d] < prev[d]) or (d == len(key) < len(prev)):
+                    raise ValueError("keys must be given in ascending order")
+
+            last = None
+            while stk[-1][1] > d:
+                last = stk.pop()[0]
+            curr, depth = stk[-1]
+            if depth < d:
+                # the common prefix ends inside the edge to `last`
+                lab = last.label
+                mid = RadixNode(parent=curr, label=lab[: d - depth])
+                curr.children[lab[0]] = mid
+                last.label = lab[d - depth :]
+                last.parent = mid
+                mid.children[last.label[0]] = last
+                stk.append((mid, d))
+                curr = mid
+            if d < len(key):
+                leaf = RadixNode(parent=curr, label=key[d:])
+                curr.children[key[d]] = leaf
+                curr._sorted = None
+                stk.append((leaf, len(key)))
+                curr = leaf
+
+            if not curr.has_value:
+                curr.has_value = True
+                trie._size += 1
+            curr.value = value
+            trie._empty = key[:0]
+            prev = key
+
+        return trie
+
+    def _get_start_node(self, start: Optional[NodeRef[T, V]]) -> RadixNode[T, V]:
+        if start is None:
+            return self.root
+        if not start.is_valid():
+            raise ReferenceError("Invalid or stale NodeRef")
+        return start._node
+
+    def _navigate(
+        self, key: Sequence[T], start: RadixNode[T, V], create: bool = False
+    ) -> Optional[RadixNode[T, V]]:
+        curr = start
+        i, n = 0, len(key)
+        while i < n:
+            e = key[i]
+            child = curr.children.get(e)
+            if child is None:
+                if not create:
+                    return None
+                leaf = RadixNode(parent=curr, label=key[i:])
+                curr.children[e] = leaf
+                curr._sorted = None
+                return leaf
+
+            lab = child.label
+            m = len(lab)
+            if key[i : i + m] == lab:
+                curr = child
+                i += m
+                continue
+            if not create:
+                return None
+
+            # split the edge at the first mismatch (or where the key ends)
+            j, lim = 1, min(m, n - i)
+            while j < lim and lab[j] == key[i + j]:
+                j += 1
+            mid = RadixNode(parent=curr, label=lab[:j])
+            curr.children[e] = mid
+            child.label = lab[j:]
+            child.parent = mid
+            mid.children[lab[j]] = child
+            curr = mid
+            i += j
+        return curr
+
+    def _locate_prefix(
+        self, prefix: Sequence[T], start: RadixNode[T, V]
+    ) -> Tuple[Optional[RadixNode[T, V]], Sequence[T]]:
+        """
+        Find the highest node whose key starts with prefix.
+        Returns (node, tail) where prefix + tail is the key of node.
+        """
+        curr = start
+        i, n = 0, len(prefix)
+        while i < n:
+            child = curr.children.get(prefix[i])
+            if child is None:
+                return None, prefix[:0]
+            lab = child.label
+            seg = prefix[i : i + len(lab)]
+            if seg == lab:
+                curr = child
+                i += len(lab)
+                continue
+            if i + len(seg) == n and lab[: len(seg)] == seg:
+                return child, lab[len(seg) :]
+            return None, prefix[:0]
+        return curr, prefix[:0]
+
+    def _remove_value(self, node: RadixNode[T, V]) -> None:
+        """Drop the value of node and restore the compressed shape around it."""
+        node.value = None
+        node.has_value = False
+        node._token += 1
+        self._size -= 1
+
+        if node is self.root:
+            return
+        if len(node.children) == 1:
+            self._merge_with_child(node)
+        elif not node.children:
+            p = node.parent
+            del p.children[node.label[0]]
+            p._sorted = None
+            if p is not self.root and not p.has_value and len(p.children) == 1:
+                self._merge_with_child(p)
+
+    def _merge_with_child(self, node: RadixNode[T, V]) -> None:
+        (child,) = node.children.values()
+        p = node.parent
+        child.label = node.label + child.label
+        child.parent = p
+        p.children[node.label[0]] = child
+
+    def get(
+        self,
+        key: Sequence[T],
+        default: Any = None,
+        root: Optional[NodeRef[T, V]] = None,
+    ) -> Any:
+        """
+        Get the value.
+        If it doesn't exist, returns the default without inserting it.
+        (dict.get behavior).
+        """
+        node = self._navigate(_as_seq(key), self._get_start_node(root))
+        return node.value if node is not None and node.has_value else default
+
+    def getitem(
+        self,
+        key: Sequence[T],
+        root: Optional[NodeRef[T, V]] = None,
+    ) -> V:
+        """Get value for key."""
+        key = _as_seq(key)
+        start = self._get_start_node(root)
+        node = self._navigate(key, start)
+        if node is None or not node.has_value:
+            if self.default_factory is None:
+                raise KeyError(key)
+            node = self._navigate(key, start, create=True)
+            node.value = self.default_factory()
+            node.has_value = True
+            self._size += 1
+            self._empty = key[:0]
+        return node.value
+
+    def setitem(
+        self, key: Sequence[T], value: V, root: Optional[NodeRef[T, V]] = None
+    ) -> NodeRef[T, V]:
+        """Set value for key."""
+        key = _as_seq(key)
+        node = self._navigate(key, self._get_start_node(root), create=True)
+        if not node.has_value:
+            node.has_value = True
+            self._size += 1
+            self._empty = key[:0]
+        node.value = value
+        return NodeRef(node, node._token)
+
+    def delitem(self, key: Sequence[T], root: Optional[NodeRef[T, V]] = None) -> None:
+        """Remove the value for key."""
+        target = self._navigate(_as_seq(key), self._get_start_node(root))
+        if target is None or not target.has_value:
+            raise KeyError(key)
+        self._remove_value(target)
+
+    def contains(self, key: Sequence[T], root: Optional[NodeRef[T, V]] = None) -> bool:
+        node = self._navigate(_as_seq(key), self._get_start_node(root))
+        return node is not None and node.has_value
+
+    def get_ref(
+        self, key: Sequence[T], root: Optional[NodeRef[T, V]] = None
+    ) -> Optional[NodeRef[T, V]]:
+        """Get a valid NodeRef for the key if it exists."""
+        node = self._navigate(_as_seq(key), self._get_start_node(root))
+        return NodeRef(node, node._token) if node and node.has_value else None
+
+    @staticmethod
+    def _sorted_keys(node: RadixNode[T, V]) -> List[T]:
+        if node._sorted is None:
+            node._sorted = sorted(node.children)
+        return node._sorted
+
+    def values(self, prefix: Sequence[T] = (), root: Optional[NodeRef[T, V]] = None):
+        """Yield value with prefix."""
+        target, _ = self._locate_prefix(_as_seq(prefix), self._get_start_node(root))
+        if not target:
+            return
+
+        stk: List[RadixNode[T, V]] = [target]
+        while stk:
+            curr = stk.pop()
+            if curr.has_value:
+                yield curr.value
+            children = curr.children
+            stk.extend(children[e] for e in reversed(self._sorted_keys(curr)))
+
+    def items(self, prefix: Sequence[T] = (), root: Optional[NodeRef[T, V]] = None):
+        """Yield (key, value) pairs starting with prefix."""
+        prefix = _as_seq(prefix) or self._empty
+        target, tail = self._locate_prefix(prefix, self._get_start_node(root))
+        if not target:
+            return
+
+        empty = prefix[:0]
+        # one shared buffer of edge labels: push on descent, pop on return
+        path: List[Sequence[T]] = [prefix, tail]
+        if target.has_value:
+            yield (_join(path, empty), target.value)
+
+        nodes: List[RadixNode[T, V]] = [target]
+        its: List[Iterator[T]] = [iter(self._sorted_keys(target))]
+        while its:
+            for e in its[-1]:
+                child = nodes[-1].children[e]
+                path.append(child.label)
+                if child.has_value:
+                    yield (_join(path, empty), child.value)
+                nodes.append(child)
+                its.append(iter(self._sorted_keys(child)))
+                break
+            else:
+                its.pop()
+                nodes.pop()
+                if nodes:
+                    path.pop()
+
+    # --- Syntactic Sugars (Absolute Path) ---
+    def __setitem__(self, key: Sequence[T], value: V):
+        self.setitem(key, value)
+
+    def __getitem__(self, key: Sequence[T]) -> V:
+        return self.getitem(key)
+
+    def __delitem__(self, key: Sequence[T]):
+        self.delitem(key)
+
+    def __contains__(self, key: Sequence[T]) -> bool:
+        return self.contains(key)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"RadixTrieMap({dict(self.items())})"
+
+
+if __name__ == "__main__":
+
+    def test():
+        print("Starting RadixTrieMap tests...")
+
+        # 1. split on insert
+        trie = RadixTrieMap[str, int](int)
+        trie["apple"] = 10
+        trie["app"] = 5
+        assert trie["apple"] == 10
+        assert trie["app"] == 5
+        assert trie.root.children["a"].label == "app"
+        assert trie.root.children["a"].children["l"].label == "le"
+        assert trie.get("ap") is None
+        assert "ap" not in trie
+        assert trie["absent"] == 0
+        assert len(trie) == 3
+        print("Check 1: passed.")
+
+        # 2. relative operations
+        ref_app = trie.get_ref("app")
+        assert trie.get("le", root=ref_app) == 10
+        trie.setitem("ly", 15, root=ref_app)
+        assert trie["apply"] == 15
+        assert len(trie) == 4
+        print("Check 2: passed.")
+
+        # 3. merge on delete keeps other refs valid
+        ref_apply = trie.get_ref("apply")
+        del trie["app"]
+        assert not ref_app.is_valid()
+        assert ref_apply.is_valid()
+        assert trie.get("", root=ref_apply) == 15
+        node = trie.root.children["a"]
+        assert node.label == "a" and set(node.children) == {"p", "b"}
+        assert node.children["p"].label == "ppl"
+        print("Check 3: passed.")
+
+        # 4. prefix ending in the middle of an edge
+        assert list(trie.items(prefix="ap")) == [("apple", 10), ("apply", 15)]
+        assert list(trie.items(prefix="appl")) == [("apple", 10), ("apply", 15)]
+        assert list(trie.values(prefix="abs")) == [0]
+        assert list(trie.items(prefix="apq")) == []
+        print("Check 4: passed.")
+
+        # 5. delete back to an empty trie
+        for k in ["apple", "apply", "absent"]:
+            del trie[k]
+        assert len(trie) == 0 and not trie.root.children
+        print("Check 5: passed.")
+
+        # 6. random comparison with dict, for str / bytes / tuple keys
+        import random
+
+        for conv in (str, bytes, tuple):
+            trie = RadixTrieMap()
+            ref = {}
+            for _ in range(3000):
+                k = "".join(random.choices("ab", k=random.randint(0, 6)))
+                k = k.encode() if conv is bytes else conv(k)
+                if random.random() < 0.6:
+                    trie[k] = ref[k] = random.randint(0, 9)
+                elif k in ref:
+                    del trie[k]
+                    del ref[k]
+                assert len(trie) == len(ref)
+            assert list(trie.items()) == sorted(ref.items())
+            assert all(trie[k] == v for k, v in ref.items())
+        print("Check 6: passed.")
+
+        # 7. bulk construction from sorted keys
+        words = sorted({"".join(random.choices("ab", k=random.randint(0, 7))) for _ in range(500)})
+        bulk = RadixTrieMap.from_sorted((w, i) for i, w in enumerate(words))
+        assert list(bulk.items()) == [(w, i) for i, w in enumerate(words)]
+        one_by_one = RadixTrieMap()
+        for i, w in enumerate(words):
+            one_by_one[w] = i
+        stk = [(bulk.root, one_by_one.root)]
+        while stk:  # same compressed shape as incremental insertion
+            x, y = stk.pop()
+            assert x.label == y.label and x.children.keys() == y.children.keys()
+            stk.extend((x.children[e], y.children[e]) for e in x.children)
+        try:
+            RadixTrieMap.from_sorted([("b", 0), ("a", 1)])
+            assert False
+        except ValueError:
+            pass
+        print("Check 7: passed.")
+
+        print("\nAll tests passed successfully!\n")
+
+    test()
@@ -1,4 +1,10 @@
 from typing import *
+from array import array
+from bisect import bisect_left
+from collections import deque
+import mmap as _mmap
+import pickle
+import struct
 
 T = TypeVar("T", bound=Hashable)
 V = TypeVar("V")
@@ -12,6 +18,10 @@ class TrieNode(Generic[T, V]):
         "_token",
         "parent",
         "key_in_parent",
+        "fail",
+        "out",
+        "_sorted",
+        "cnt",
     )
 
     def __init__(
@@ -25,6 +35,13 @@ class TrieNode(Generic[T, V]):
         self._token: int = 0
         self.parent = parent
         self.key_in_parent = key_in_parent
+        # Aho-Corasick links, filled by TrieMap.build_automaton
+        self.fail: Optional["TrieNode[T, V]"] = None
+        self.out: Optional["TrieNode[T, V]"] = None
+        # sorted child keys, cached until the set of children changes
+        self._sorted: Optional[List[T]] = None
+        # number of values in the subtree (maintained only with TrieMap(with_count=True))
+        self.cnt: int = 0
 
     def __repr__(self):
         return f"{self.value}"
@@ -44,12 +61,66 @@ class NodeRef(Generic[T, V]):
 class TrieMap(Generic[T, V]):
     """
     Trie-based mapping (Sequence[T] -> V) with support for relative operations.
+
+    with_count=True keeps the number of values in every subtree, which enables
+    count_prefix / kth_key / rank. Each insertion or deletion then also walks up
+    to the absolute root, so it costs O(depth of the node) even for relative operations.
     """
 
-    def __init__(self, default_factory: Optional[Callable[[], V]] = None) -> None:
+    def __init__(
+        self,
+        default_factory: Optional[Callable[[], V]] = None,
+        with_count: bool = False,
+    ) -> None:
         self.root: TrieNode[T, V] = TrieNode()
         self.default_factory = default_factory
+        self.with_count = with_count
         self._size: int = 0
+        self._automaton_ready: bool = False
+
+    @classmethod
+    def from_sorted(
+        cls,
+        items: Iterable[Tuple[Sequence[T], V]],
+        default_factory: Optional[Callable[[], V]] = None,
+        with_count: bool = False,
+    ) -> "TrieMap[T, V]":
+        """
+        Build a TrieMap from (key, value) pairs in ascending key order. O(total key length)
+        Nodes on the common prefix with the previous key are kept on a stack,
+        so each key only creates its new suffix. A repeated key keeps the last value.
+        """
+        trie = cls(default_factory, with_count)
+        stk: List[TrieNode[T, V]] = [trie.root]  # stk[d]: node of prev[:d]
+        prev: Optional[Sequence[T]] = None
+
+        for key, value in items:
+            d = 0
+            if prev is not None:
+                lim = min(len(key), len(prev))
+                while d < lim and key[d] == prev[d]:
+                    d += 1
+                if (d < lim and key[d] < prev[d]) or (d == len(key) < len(prev)):
+                    raise ValueError("keys must be given in ascending order")
+                del stk[d + 1 :]
+
+            curr = stk[-1]
+            for e in key[d:]:
+                child = TrieNode(parent=curr, key_in_parent=e)
+                curr.children[e] = child
+                stk.append(child)
+                curr = child
+
+            if not curr.has_value:
+                curr.has_value = True
+                trie._size += 1
+                if with_count:
+                    for node in stk:
+                        node.cnt += 1
+            curr.value = value
+            prev = key
+
+        return trie
 
     def _get_start_node(self, start: Optional[NodeRef[T, V]]) -> TrieNode[T, V]:
         if start is None:
@@ -67,9 +138,29 @@ class TrieMap(Generic[T, V]):
                 if not create:
                     return None
                 curr.children[e] = TrieNode(parent=curr, key_in_parent=e)
+                curr._sorted = None
+                self._automaton_ready = False
             curr = curr.children[e]
         return curr
 
+    def _add_count(self, node: TrieNode[T, V], d: int) -> None:
+        if not self.with_count:
+            return
+        while node is not None:
+            node.cnt += d
+            node = node.parent
+
+    def _require_count(self) -> None:
+        if not self.with_count:
+            raise ValueError("this operation requires TrieMap(with_count=True)")
+
+    def _is_str(self, prefix: Sequence[T]) -> bool:
+        return isinstance(prefix, str) or bool(
+            len(prefix) == 0
+            and self.root.children
+            and isinstance(next(iter(self.root.children.keys())), str)
+        )
+
     def get(
         self,
         key: Sequence[T],
@@ -97,6 +188,8 @@ class TrieMap(Generic[T, V]):
             node.value = self.default_factory()
             node.has_value = True
             self._size += 1
+            self._add_count(node, 1)
+            self._automaton_ready = False
         return node.value
 
     def setitem(
@@ -107,6 +200,8 @@ class TrieMap(Generic[T, V]):
         if not node.has_value:
             node.has_value = True
             self._size += 1
+            self._add_count(node, 1)
+            self._automaton_ready = False
         node.value = value
         return NodeRef(node, node._token)
 
@@ -122,12 +217,15 @@ class TrieMap(Generic[T, V]):
         target.has_value = False
         target._token += 1
         self._size -= 1
+        self._add_count(target, -1)
+        self._automaton_ready = False
 
         curr = target
         while curr is not start_node and curr.parent is not None:
             if not curr.children and not curr.has_value:
                 p = curr.parent
                 del p.children[curr.key_in_parent]
+                p._sorted = None
                 curr = p
             else:
                 break
@@ -144,6 +242,91 @@ class TrieMap(Generic[T, V]):
         node = self._navigate(key, self._get_start_node(root), create=False)
         return NodeRef(node, node._token) if node and node.has_value else None
 
+    def _walk_sorted(
+        self, keys: Sequence[Sequence[T]], start: TrieNode[T, V]
+    ) -> Iterator[Tuple[int, List[TrieNode[T, V]], List[int]]]:
+        """
+        Visit the queries in key order, sharing the walk over common prefixes.
+        Yields (i, path, best): path[d] is the node of keys[i][:d] (as deep as it exists),
+        best[-1] is the deepest d on the path whose node holds a value (-1 if none).
+        """
+        path: List[TrieNode[T, V]] = [start]
+        best: List[int] = [0 if start.has_value else -1]
+        prev: Optional[Sequence[T]] = None
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[i]
+            d = 0
+            if prev is not None:
+                lim = min(len(key), len(prev), len(path) - 1)
+                while d < lim and key[d] == prev[d]:
+                    d += 1
+                del path[d + 1 :]
+                del best[d + 1 :]
+
+            curr = path[-1]
+            for e in key[d:]:
+                curr = curr.children.get(e)
+                if curr is None:
+                    break
+                path.append(curr)
+                best.append(len(path) - 1 if curr.has_value else best[-1])
+            yield i, path, best
+            prev = key
+
+    def lookup_many(
+        self,
+        keys: Sequence[Sequence[T]],
+        default: Any = None,
+        root: Optional[NodeRef[T, V]] = None,
+    ) -> List[Any]:
+        """
+        [self.get(key, default) for key in keys], with the queries sorted so that
+        common prefixes are walked once. Keys must be mutually comparable.
+        """
+        res = [default] * len(keys)
+        for i, path, _ in self._walk_sorted(keys, self._get_start_node(root)):
+            node = path[-1]
+            if len(path) == len(keys[i]) + 1 and node.has_value:
+                res[i] = node.value
+        return res
+
+    def longest_prefix(
+        self, key: Sequence[T], root: Optional[NodeRef[T, V]] = None
+    ) -> Optional[Tuple[int, V]]:
+        """
+        Longest prefix of key that holds a value, as (prefix length, value).
+        Returns None if no prefix (including the empty one) holds a value.
+        """
+        curr = self._get_start_node(root)
+        res = (0, curr.value) if curr.has_value else None
+        for d, e in enumerate(key, 1):
+            curr = curr.children.get(e)
+            if curr is None:
+                break
+            if curr.has_value:
+                res = (d, curr.value)
+        return res
+
+    def longest_prefix_many(
+        self, keys: Sequence[Sequence[T]], root: Optional[NodeRef[T, V]] = None
+    ) -> List[Optional[Tuple[int, V]]]:
+        """
+        [self.longest_prefix(key) for key in keys], with the queries sorted so that
+        common prefixes are walked once. Keys must be mutually comparable.
+        """
+        res: List[Optional[Tuple[int, V]]] = [None] * len(keys)
+        for i, path, best in self._walk_sorted(keys, self._get_start_node(root)):
+            d = best[-1]
+            if d >= 0:
+                res[i] = (d, path[d].value)
+        return res
+
+    @staticmethod
+    def _sorted_keys(node: TrieNode[T, V]) -> List[T]:
+        if node._sorted is None:
+            node._sorted = sorted(node.children)
+        return node._sorted
+
     def values(self, prefix: Sequence[T] = (), root: Optional[NodeRef[T, V]] = None):
         """Yield value with prefix."""
         start = self._get_start_node(root)
@@ -156,8 +339,8 @@ class TrieMap(Generic[T, V]):
             curr = stk.pop()
             if curr.has_value:
                 yield curr.value
-            for _, child in sorted(curr.children.items(), reverse=True):
-                stk.append(child)
+            children = curr.children
+            stk.extend(children[e] for e in reversed(self._sorted_keys(curr)))
 
     def items(self, prefix: Sequence[T] = (), root: Optional[NodeRef[T, V]] = None):
         """Yield (key, value) pairs starting with prefix."""
@@ -166,19 +349,209 @@ class TrieMap(Generic[T, V]):
         if not target:
             return
 
-        is_str = isinstance(prefix, str) or (
-            len(prefix) == 0
-            and self.root.children
-            and isinstance(next(iter(self.root.children.keys())), str)
-        )
+        is_str = self._is_str(prefix)
+
+        # one shared path buffer: push on descent, pop on return
+        path: List[T] = list(prefix)
+        if target.has_value:
+            yield ("".join(path) if is_str else tuple(path), target.value)
+
+        nodes: List[TrieNode[T, V]] = [target]
+        its: List[Iterator[T]] = [iter(self._sorted_keys(target))]
+        while its:
+            for e in its[-1]:
+                child = nodes[-1].children[e]
+                path.append(e)
+                if child.has_value:
+                    yield ("".join(path) if is_str else tuple(path), child.value)
+                nodes.append(child)
+                its.append(iter(self._sorted_keys(child)))
+                break
+            else:
+                its.pop()
+                nodes.pop()
+                if nodes:
+                    path.pop()
+
+    def count_prefix(
+        self, prefix: Sequence[T] = (), root: Optional[NodeRef[T, V]] = None
+    ) -> int:
+        """Number of keys starting with prefix. O(len(prefix)) (with_count=True only)"""
+        self._require_count()
+        node = self._navigate(prefix, self._get_start_node(root), create=False)
+        return node.cnt if node is not None else 0
+
+    def kth_key(
+        self,
+        k: int,
+        prefix: Sequence[T] = (),
+        root: Optional[NodeRef[T, V]] = None,
+    ) -> Sequence[T]:
+        """
+        Returns the k-th (0-indexed) key starting with prefix, in the order of items().
+        O(key length * alphabet) (with_count=True only)
+        """
+        self._require_count()
+        node = self._navigate(prefix, self._get_start_node(root), create=False)
+        n = node.cnt if node is not None else 0
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("kth_key index out of range")
+
+        path: List[T] = list(prefix)
+        while True:
+            if node.has_value:
+                if k == 0:
+                    break
+                k -= 1
+            children = node.children
+            for e in self._sorted_keys(node):
+                c = children[e].cnt
+                if k < c:
+                    path.append(e)
+                    node = children[e]
+                    break
+                k -= c
+        return "".join(path) if self._is_str(prefix) else tuple(path)
+
+    def rank(self, key: Sequence[T], root: Optional[NodeRef[T, V]] = None) -> int:
+        """
+        Number of keys smaller than key, in the order of items().
+        O(len(key) * alphabet) (with_count=True only)
+        """
+        self._require_count()
+        node = self._get_start_node(root)
+        res = 0
+        for e in key:
+            if node.has_value:  # a proper prefix of key
+                res += 1
+            children = node.children
+            for f in self._sorted_keys(node):
+                if not f < e:
+                    break
+                res += children[f].cnt
+            node = children.get(e)
+            if node is None:
+                break
+        return res
 
-        stk: List[Tuple[TrieNode[T, V], List[T]]] = [(target, list(prefix))]
-        while stk:
-            curr, path = stk.pop()
-            if curr.has_value:
-                yield ("".join(path) if is_str else tuple(path), curr.value)
-            for e, child in sorted(curr.children.items(), reverse=True):
-                stk.append((child, path + [e]))
+    def build_automaton(self) -> None:
+        """
+        Build Aho-Corasick failure / output links over the current nodes. O(total key length)
+        `fail` points to the longest proper suffix present in the trie,
+        `out` to the nearest node on the fail chain that holds a value (the empty key is never reported).
+        Any write that adds a node or a value invalidates the links.
+        """
+        root = self.root
+        root.fail = root
+        root.out = None
+
+        que: Deque[TrieNode[T, V]] = deque()
+        for child in root.children.values():
+            child.fail = root
+            child.out = None
+            que.append(child)
+
+        while que:
+            u = que.popleft()
+            for e, v in u.children.items():
+                f = u.fail
+                while f is not root and e not in f.children:
+                    f = f.fail
+                f = f.children.get(e, root)
+                v.fail = f
+                v.out = f if f.has_value and f is not root else f.out
+                que.append(v)
+
+        self._automaton_ready = True
+
+    def match_stream(self, chunks: Iterable[Sequence[T]]) -> Iterator[Tuple[int, V]]:
+        """
+        Scan the concatenation of chunks in one pass and yield (end_pos, value)
+        for every occurrence of every key, where text[end_pos - len(key):end_pos] == key.
+        The automaton is (re)built first if it is stale.
+        Complexity: O(text length + number of matches)
+        """
+        if not self._automaton_ready:
+            self.build_automaton()
+
+        root = self.root
+        state = root
+        pos = 0
+        for chunk in chunks:
+            for e in chunk:
+                while state is not root and e not in state.children:
+                    state = state.fail
+                state = state.children.get(e, root)
+                pos += 1
+
+                node = state if state.has_value and state is not root else state.out
+                while node is not None:
+                    yield (pos, node.value)
+                    node = node.out
+
+    def dump(self, path: str) -> None:
+        """
+        Write the trie to path in a flat binary format readable by TrieMap.load.
+
+        Layout (native int64): header, child offsets, edge labels and value indices of the
+        nodes in BFS order (children sorted), then a table of separately pickled values.
+        Edge labels must all be single-character str or all be int (e.g. bytes keys).
+        """
+        nodes: List[TrieNode[T, V]] = [self.root]
+        off = array("q", [1])
+        label = array("q", [0])
+        vidx = array("q")
+        voff = array("q", [0])
+        blobs: List[bytes] = []
+        kind = -1  # 0: int labels, 1: str labels
+
+        for v in nodes:  # BFS: children of v become nodes off[v] .. off[v + 1] - 1
+            vidx.append(len(blobs) if v.has_value else -1)
+            if v.has_value:
+                b = pickle.dumps(v.value, protocol=pickle.HIGHEST_PROTOCOL)
+                blobs.append(b)
+                voff.append(voff[-1] + len(b))
+            children = v.children
+            for e in self._sorted_keys(v):
+                if kind == -1:
+                    kind = 1 if isinstance(e, str) else 0
+                if kind == 1:
+                    if not (isinstance(e, str) and len(e) == 1):
+                        raise ValueError(f"cannot dump edge label {e!r}")
+                    label.append(ord(e))
+                else:
+                    if not isinstance(e, int):
+                        raise ValueError(f"cannot dump edge label {e!r}")
+                    label.append(e)
+                nodes.append(children[e])
+            off.append(len(nodes))
+
+        with open(path, "wb") as f:
+            f.write(
+                struct.pack(
+                    _HEADER, _MAGIC, max(kind, 0), len(nodes), len(blobs), voff[-1]
+                )
+            )
+            for arr in (off, label, vidx, voff):
+                arr.tofile(f)
+            for b in blobs:
+                f.write(b)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> "FrozenTrieMap[T, V]":
+        """
+        Open a file written by dump as a read-only FrozenTrieMap.
+        With mmap=True nothing is parsed up front: lookups read the mapped pages directly,
+        so startup is O(1) and the pages are shared between processes.
+        """
+        with open(path, "rb") as f:
+            if mmap:
+                buf = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+            else:
+                buf = f.read()
+        return FrozenTrieMap(buf)
 
     # --- Syntactic Sugars (Absolute Path) ---
     def __setitem__(self, key: Sequence[T], value: V):
@@ -200,6 +573,119 @@ class TrieMap(Generic[T, V]):
         return f"TrieMap({dict(self.items())})"
 
 
+_MAGIC = b"TRIEMAP1"
+_HEADER = "=8sqqqq"  # magic, label kind, #nodes, #values, value blob size
+
+
+class FrozenTrieMap(Generic[T, V]):
+    """
+    Read-only TrieMap served from a buffer written by TrieMap.dump.
+    Children are found by binary search over the sorted label array; values are unpickled on access.
+    """
+
+    def __init__(self, buf: Union[bytes, _mmap.mmap]) -> None:
+        magic, kind, n, m, blob_len = struct.unpack_from(_HEADER, buf, 0)
+        if magic != _MAGIC:
+            raise ValueError("not a TrieMap dump")
+        self._buf = buf
+        self._is_str = kind == 1
+        self._size = m
+
+        h = struct.calcsize(_HEADER)
+        start = h + 8 * (3 * n + m + 2)
+        q = memoryview(buf)[h:start].cast("q")
+        self._off = q[: n + 1]
+        self._label = q[n + 1 : 2 * n + 1]
+        self._vidx = q[2 * n + 1 : 3 * n + 1]
+        self._voff = q[3 * n + 1 :]
+        self._blob = memoryview(buf)[start : start + blob_len]
+
+    def _child(self, v: int, e: T) -> int:
+        """Node index of child e of v, or -1."""
+        if self._is_str:
+            if not (isinstance(e, str) and len(e) == 1):
+                return -1
+            e = ord(e)
+        elif not isinstance(e, int):
+            return -1
+        lo, hi = self._off[v], self._off[v + 1]
+        i = bisect_left(self._label, e, lo, hi)
+        return i if i < hi and self._label[i] == e else -1
+
+    def _navigate(self, key: Sequence[T]) -> int:
+        v = 0
+        for e in key:
+            v = self._child(v, e)
+            if v < 0:
+                return -1
+        return v
+
+    def _value(self, v: int) -> V:
+        i = self._vidx[v]
+        return pickle.loads(self._blob[self._voff[i] : self._voff[i + 1]])
+
+    def get(self, key: Sequence[T], default: Any = None) -> Any:
+        v = self._navigate(key)
+        return self._value(v) if v >= 0 and self._vidx[v] >= 0 else default
+
+    def contains(self, key: Sequence[T]) -> bool:
+        v = self._navigate(key)
+        return v >= 0 and self._vidx[v] >= 0
+
+    def values(self, prefix: Sequence[T] = ()):
+        """Yield value with prefix."""
+        for _, value in self.items(prefix):
+            yield value
+
+    def items(self, prefix: Sequence[T] = ()):
+        """Yield (key, value) pairs starting with prefix."""
+        target = self._navigate(prefix)
+        if target < 0:
+            return
+        off, label, vidx = self._off, self._label, self._vidx
+        conv = chr if self._is_str else int
+        join = "".join if self._is_str else tuple
+
+        path: List[T] = list(prefix)
+        stk: List[Tuple[int, int]] = [(target, off[target])]  # (node, next child)
+        if vidx[target] >= 0:
+            yield (join(path), self._value(target))
+        while stk:
+            v, c = stk[-1]
+            if c == off[v + 1]:
+                stk.pop()
+                if stk:
+                    path.pop()
+                continue
+            stk[-1] = (v, c + 1)
+            path.append(conv(label[c]))
+            if vidx[c] >= 0:
+                yield (join(path), self._value(c))
+            stk.append((c, off[c]))
+
+    def close(self) -> None:
+        """Release the buffer (closes the mmap if there is one)."""
+        for mv in (self._off, self._label, self._vidx, self._voff, self._blob):
+            mv.release()
+        if isinstance(self._buf, _mmap.mmap):
+            self._buf.close()
+
+    def __getitem__(self, key: Sequence[T]) -> V:
+        v = self._navigate(key)
+        if v < 0 or self._vidx[v] < 0:
+            raise KeyError(key)
+        return self._value(v)
+
+    def __contains__(self, key: Sequence[T]) -> bool:
+        return self.contains(key)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"FrozenTrieMap({dict(self.items())})"
+
+
 if __name__ == "__main__":
 
     def test():
@@ -267,6 +753,120 @@ if __name__ == "__main__":
         assert len(trie) == 1
         print("Check 6: passed.")
 
+        # 7. Aho-Corasick over chunked input
+        ac = TrieMap[str, str]()
+        for w in ["he", "she", "his", "hers"]:
+            ac[w] = w
+        text = "ushershishe"
+        got = list(ac.match_stream(text[i : i + 3] for i in range(0, len(text), 3)))
+        want = [
+            (j, w)
+            for j in range(len(text) + 1)
+            for w in ["he", "she", "his", "hers"]
+            if text[:j].endswith(w)
+        ]
+        assert sorted(got) == sorted(want)
+        ac["us"] = "us"  # invalidates, rebuilt on the next scan
+        assert (2, "us") in list(ac.match_stream([text]))
+        print("Check 7: passed.")
+
+        # 8. sorted iteration stays correct across writes
+        import random
+
+        trie = TrieMap()
+        ref = {}
+        for _ in range(2000):
+            k = "".join(random.choices("abc", k=random.randint(0, 5)))
+            if random.random() < 0.7:
+                trie[k] = ref[k] = len(ref)
+            elif k in ref:
+                del trie[k]
+                del ref[k]
+            if random.random() < 0.05:
+                assert list(trie.items()) == sorted(ref.items())
+                assert list(trie.values("a")) == [
+                    v for k, v in sorted(ref.items()) if k.startswith("a")
+                ]
+        print("Check 8: passed.")
+
+        # 9. bulk construction from sorted keys
+        bulk = TrieMap.from_sorted(sorted(ref.items()))
+        assert list(bulk.items()) == sorted(ref.items())
+        assert len(bulk) == len(ref)
+        try:
+            TrieMap.from_sorted([("b", 0), ("a", 1)])
+            assert False
+        except ValueError:
+            pass
+        print("Check 9: passed.")
+
+        # 10. subtree counts
+        trie = TrieMap(int, with_count=True)
+        for k in ref:
+            trie[k] += 1
+        trie["zz"]  # default_factory insertion
+        keys = sorted(ref) + ["zz"]
+        for _ in range(200):
+            k = "".join(random.choices("abc", k=random.randint(0, 3)))
+            if random.random() < 0.3 and k in trie:
+                del trie[k]
+                keys.remove(k)
+            assert trie.count_prefix(k) == sum(w.startswith(k) for w in keys)
+            assert trie.rank(k) == sum(w < k for w in keys)
+        for i, w in enumerate(keys):
+            assert trie.kth_key(i) == w
+        sub = [w for w in keys if w.startswith("ab")]
+        assert [trie.kth_key(i, "ab") for i in range(len(sub))] == sub
+        bulk = TrieMap.from_sorted(((w, 0) for w in keys), with_count=True)
+        assert all(bulk.rank(w) == i for i, w in enumerate(keys))
+        print("Check 10: passed.")
+
+        # 11. batched lookups and longest prefix match
+        trie = TrieMap()
+        for w in ["/", "/api", "/api/v1", "/static"]:
+            trie[w] = w
+        queries = ["/api/v1/users", "/apx", "/static", "", "/api/v", "/api"]
+        assert trie.lookup_many(queries, -1) == [trie.get(q, -1) for q in queries]
+        assert trie.longest_prefix_many(queries) == [
+            (7, "/api/v1"),
+            (1, "/"),
+            (7, "/static"),
+            None,
+            (4, "/api"),
+            (4, "/api"),
+        ]
+        assert trie.longest_prefix_many(queries) == [trie.longest_prefix(q) for q in queries]
+        print("Check 11: passed.")
+
+        # 12. dump / load
+        import os
+        import tempfile
+
+        trie = TrieMap()
+        for k in ref:
+            trie[k] = [k, len(k)]
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trie.bin")
+            trie.dump(path)
+            for use_mmap in (True, False):
+                frozen = TrieMap.load(path, mmap=use_mmap)
+                assert len(frozen) == len(trie)
+                assert list(frozen.items()) == list(trie.items())
+                assert list(frozen.items("ab")) == list(trie.items("ab"))
+                assert all(frozen[k] == [k, len(k)] for k in ref)
+                assert "zzz" not in frozen and frozen.get("abcabc", 0) == 0
+                frozen.close()
+
+            ints = TrieMap()
+            ints[b"\x00\x01"] = 1
+            ints[(0,)] = 0
+            ints.dump(path)
+            frozen = TrieMap.load(path)
+            assert frozen[b"\x00\x01"] == 1 and frozen[[0]] == 0
+            assert list(frozen.items()) == [((0,), 0), ((0, 1), 1)]
+            frozen.close()
+        print("Check 12: passed.")
+
         print("\nAll tests passed successfully!\n")
 
     def abc437e():